@@ -0,0 +1,101 @@
+import argparse
+import os
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+from src.ab_evaluator import MODES, evaluate_ab, summarize_ab
+from src.client import get_colivara_client
+
+timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# Ensure the output directory exists
+os.makedirs("out", exist_ok=True)
+
+
+def main(
+    base_url_a: str,
+    api_key_a: Optional[str],
+    base_url_b: str,
+    api_key_b: Optional[str],
+    collection_name: str,
+    n_rows: Optional[int],
+    top_k: int,
+    mode: str,
+    confidence: float,
+) -> None:
+    client_a = get_colivara_client(base_url_a, api_key_a)
+    client_b = get_colivara_client(base_url_b, api_key_b)
+
+    queries_df: pd.DataFrame = pd.read_pickle(f"data/queries/{collection_name}_queries.pkl")
+    queries_df.dropna(subset=["query"], inplace=True)
+    if n_rows is not None:
+        queries_df = queries_df.head(n_rows).copy()  # Create a copy to avoid warnings
+
+    print(f"\nA/B evaluating {collection_name} ({mode}): A={base_url_a}, B={base_url_b}")
+    results = evaluate_ab(queries_df, client_a, client_b, collection_name, top_k, mode)
+    summary = summarize_ab(results, confidence)
+    print(f"\nPaired differences (B - A) with {confidence:.0%} confidence intervals:")
+    print(summary.to_string(index=False))
+
+    results.to_pickle(f"out/ab_results_{collection_name}_{timestamp}.pkl")
+    summary.to_pickle(f"out/ab_summary_{collection_name}_{timestamp}.pkl")
+    print(f"A/B results saved to out/ab_results_{collection_name}_{timestamp}.pkl")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare two Colivara endpoints with paired, interleaved searches."
+    )
+    parser.add_argument("--base_url_a", type=str, required=True, help="Base URL of endpoint A")
+    parser.add_argument(
+        "--api_key_a",
+        type=str,
+        default=None,
+        help="API key of endpoint A (optional, defaults to COLIVARA_API_KEY)",
+    )
+    parser.add_argument("--base_url_b", type=str, required=True, help="Base URL of endpoint B")
+    parser.add_argument(
+        "--api_key_b",
+        type=str,
+        default=None,
+        help="API key of endpoint B (optional, defaults to COLIVARA_API_KEY)",
+    )
+    parser.add_argument(
+        "--collection_name",
+        type=str,
+        required=True,
+        help="Collection to search on both endpoints, e.g. arxivqa_test_subsampled",
+    )
+    parser.add_argument(
+        "--n_rows",
+        type=int,
+        default=None,
+        help="Number of rows to load from query data (optional, loads all if not specified)",
+    )
+    parser.add_argument("--top_k", type=int, default=5, help="Number of top results to consider")
+    parser.add_argument(
+        "--mode",
+        type=str,
+        choices=MODES,
+        default="interleaved",
+        help="Send the two searches back to back in random order, or at the same time",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the intervals",
+    )
+
+    args = parser.parse_args()
+    main(
+        args.base_url_a,
+        args.api_key_a,
+        args.base_url_b,
+        args.api_key_b,
+        args.collection_name,
+        args.n_rows,
+        args.top_k,
+        args.mode,
+        args.confidence,
+    )
@@ -1,5 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Optional
 from src.client import get_colivara_client
 
+MAX_WORKERS = 10
+
 
 def list_collections(client) -> list:
     """
@@ -14,41 +19,224 @@ def list_collections(client) -> list:
     return [col.name for col in client.list_collections()]
 
 
-def delete_collection(client, collection_name: str) -> None:
+def delete_collection(client, collection_name: str, check_exists: bool = True) -> None:
     """
     Deletes a specified collection from the Colivara client.
 
     Args:
         client: The Colivara client instance.
         collection_name (str): The name of the collection to delete.
+        check_exists (bool, optional): Check that the collection exists first. Bulk
+            operations list the collections once up front and skip this. Defaults to True.
 
     Raises:
         ValueError: If the collection does not exist.
     """
-    if collection_name not in list_collections(client):
+    if check_exists and collection_name not in list_collections(client):
         raise ValueError(f"Collection '{collection_name}' does not exist.")
 
     client.delete_collection(collection_name)
     print(f"Collection '{collection_name}' successfully deleted.")
 
 
+def match_collections(names: List[str], patterns: List[str]) -> List[str]:
+    """
+    Select the collection names matching any of the given glob patterns.
+
+    Args:
+        names (List[str]): The collection names to select from.
+        patterns (List[str]): Glob patterns, e.g. "syntheticDocQA_*".
+
+    Returns:
+        List[str]: The matching names, in their original order.
+    """
+    return [name for name in names if any(fnmatchcase(name, p) for p in patterns)]
+
+
+def run_concurrently(
+    fn: Callable[[str], Any], collection_names: List[str], max_workers: int = MAX_WORKERS
+) -> Dict[str, Any]:
+    """
+    Run a per-collection call for many collections concurrently.
+
+    Args:
+        fn (Callable[[str], Any]): The call to make for each collection name.
+        collection_names (List[str]): The collections to run it for.
+        max_workers (int, optional): Maximum number of concurrent calls.
+
+    Returns:
+        Dict[str, Any]: The result of each call, or the exception it raised.
+    """
+    if not collection_names:
+        return {}
+
+    def safe_call(name: str) -> Any:
+        try:
+            return fn(name)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(collection_names))) as pool:
+        return dict(zip(collection_names, pool.map(safe_call, collection_names)))
+
+
+def delete_collections(client, patterns: List[str]) -> Dict[str, Any]:
+    """
+    Deletes every collection matching the given glob patterns, concurrently.
+
+    Args:
+        client: The Colivara client instance, shared by all calls.
+        patterns (List[str]): Glob patterns selecting the collections to delete.
+
+    Returns:
+        Dict[str, Any]: None for each deleted collection, or the exception raised.
+    """
+    targets = match_collections(list_collections(client), patterns)
+    return run_concurrently(
+        lambda name: delete_collection(client, name, check_exists=False), targets
+    )
+
+
+def create_collections(client, collection_names: List[str]) -> Dict[str, Any]:
+    """
+    Creates the given collections concurrently, skipping those that already exist.
+
+    Args:
+        client: The Colivara client instance, shared by all calls.
+        collection_names (List[str]): The collections to create.
+
+    Returns:
+        Dict[str, Any]: The created collection for each name, or the exception raised.
+    """
+    existing = set(list_collections(client))
+    targets = [name for name in collection_names if name not in existing]
+    return run_concurrently(client.create_collection, targets)
+
+
+def reset_collections(client, patterns: List[str]) -> Dict[str, Any]:
+    """
+    Deletes and re-creates every collection matching the given glob patterns.
+
+    Args:
+        client: The Colivara client instance, shared by all calls.
+        patterns (List[str]): Glob patterns selecting the collections to reset.
+
+    Returns:
+        Dict[str, Any]: The re-created collection for each name, or the exception raised.
+    """
+    targets = match_collections(list_collections(client), patterns)
+
+    def reset(name: str) -> Any:
+        delete_collection(client, name, check_exists=False)
+        return client.create_collection(name)
+
+    return run_concurrently(reset, targets)
+
+
+def collection_stats(client, patterns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Lists collections with their document and page counts.
+
+    The API reports no byte size for collections or documents, so the page count
+    stands in for collection size: each page is stored and searched as one set of
+    embeddings. Document counts come from the collection listing. Page counts need
+    one list_documents call per collection, which run concurrently.
+
+    Args:
+        client: The Colivara client instance, shared by all calls.
+        patterns (Optional[List[str]], optional): Glob patterns selecting the collections.
+            Defaults to all.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per collection with 'name', 'num_documents' and 'num_pages'.
+    """
+    collections = {col.name: col for col in client.list_collections()}
+    targets = match_collections(list(collections), patterns or ["*"])
+    documents = run_concurrently(client.list_documents, targets)
+
+    stats = []
+    for name in targets:
+        docs = documents[name]
+        stats.append(
+            {
+                "name": name,
+                "num_documents": collections[name].num_documents,
+                "num_pages": None
+                if isinstance(docs, Exception)
+                else sum(doc.num_pages for doc in docs),
+            }
+        )
+    return stats
+
+
+def print_results(action: str, results: Dict[str, Any]) -> None:
+    """Print the outcome of a bulk operation."""
+    if not results:
+        print(f"No collections to {action}.")
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            print(f"Failed to {action} '{name}': {result}")
+        elif action != "delete":
+            print(f"Collection '{name}': {action} succeeded.")
+
+
 if __name__ == "__main__":
     import argparse
 
-    client = get_colivara_client()
-
     parser = argparse.ArgumentParser(description="Manage collections in Colivara.")
     parser.add_argument("--delete", type=str, help="Name of the collection to delete.")
     parser.add_argument("--list", action="store_true", help="List all collections.")
+    parser.add_argument(
+        "--stats",
+        type=str,
+        nargs="*",
+        help="List collections matching the glob patterns (all if none) with document and page counts.",
+    )
+    parser.add_argument(
+        "--delete_pattern",
+        type=str,
+        nargs="+",
+        help="Delete all collections matching the glob patterns, concurrently.",
+    )
+    parser.add_argument(
+        "--create",
+        type=str,
+        nargs="+",
+        help="Create the named collections, concurrently, skipping existing ones.",
+    )
+    parser.add_argument(
+        "--reset_pattern",
+        type=str,
+        nargs="+",
+        help="Delete and re-create all collections matching the glob patterns, concurrently.",
+    )
 
     args = parser.parse_args()
 
+    client = get_colivara_client()
+
     if args.list:
         collections = list_collections(client)
         print("Available collections:", collections)
 
+    if args.stats is not None:
+        for entry in collection_stats(client, args.stats or ["*"]):
+            print(
+                f"{entry['name']}: {entry['num_documents']} documents, "
+                f"{entry['num_pages']} pages"
+            )
+
     if args.delete:
         try:
             delete_collection(client, args.delete)
         except ValueError as e:
             print(e)
+
+    if args.delete_pattern:
+        print_results("delete", delete_collections(client, args.delete_pattern))
+
+    if args.reset_pattern:
+        print_results("reset", reset_collections(client, args.reset_pattern))
+
+    if args.create:
+        print_results("create", create_collections(client, args.create))
@@ -0,0 +1,61 @@
+import argparse
+from typing import List, Optional
+import pandas as pd
+from src.data_loader import load_data, deduplicate_pages
+from src.ingest_profile import estimate_ingest_time, load_profile
+
+
+def main(
+    profile_file: str,
+    files: List[str],
+    n_rows: Optional[int],
+    dedup: bool,
+) -> None:
+    profile = load_profile(profile_file)
+    print(f"Fitting ingest costs from {len(profile)} profiled documents in {profile_file}")
+
+    rows = []
+    for file_path in files:
+        df: pd.DataFrame = load_data(file_path, nrows=n_rows)
+        if dedup:
+            df = deduplicate_pages(df)
+        estimate = estimate_ingest_time(df, profile)
+        rows.append({"file": file_path, **estimate})
+        print(
+            f"{file_path}: {estimate['num_documents']} documents, "
+            f"~{estimate['predicted_seconds'] / 60:.1f} min "
+            f"({estimate['lower_seconds'] / 60:.1f}-{estimate['upper_seconds'] / 60:.1f} min)"
+        )
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Estimate how long upserting datasets will take, from a measured ingest profile."
+    )
+    parser.add_argument(
+        "--profile_file",
+        type=str,
+        required=True,
+        help="Parquet file of ingest records written by upsert.py --profile_file",
+    )
+    parser.add_argument(
+        "files",
+        type=str,
+        nargs="+",
+        help="Dataset pickles or dataset directories to estimate, e.g. data/full/tatdqa_test.pkl",
+    )
+    parser.add_argument(
+        "--n_rows",
+        type=int,
+        default=None,
+        help="Number of rows to load from each dataset (optional, loads all if not specified)",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Estimate for deduplicated ingestion, as with upsert.py --dedup",
+    )
+
+    args = parser.parse_args()
+    main(args.profile_file, args.files, args.n_rows, args.dedup)
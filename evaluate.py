@@ -6,6 +6,7 @@ import os
 from src.evaluator import evaluate_rag_model
 from tenacity import retry, stop_after_attempt, wait_fixed
 from src.client import get_colivara_client
+from src.metrics import start_live_metrics
 
 client = get_colivara_client()
 
@@ -69,15 +70,18 @@ def validate_api_key() -> bool:
     stop=stop_after_attempt(5),  # Retry up to 5 times
     wait=wait_fixed(2),  # Wait 2 seconds between attempts
 )
-def evaluate_with_retry(queries_df, client, collection_name):
+def evaluate_with_retry(queries_df, client, collection_name, rankings_path=None):
     """Wrapper around evaluate_rag_model to add retry mechanism."""
-    return evaluate_rag_model(queries_df, client, collection_name)
+    return evaluate_rag_model(
+        queries_df, client, collection_name, rankings_path=rankings_path
+    )
 
 
 def process_file(
     query_file: str,
     collection_name: str,
     n_rows: Optional[int],
+    save_rankings: bool = False,
 ):
     queries_df: pd.DataFrame = pd.read_pickle(f"data/queries/{query_file}")
     queries_df.dropna(subset=["query"], inplace=True)
@@ -86,8 +90,11 @@ def process_file(
     base_file_name = os.path.splitext(query_file)[0]
 
     # Evaluate the RAG model with retry logic
-    avg_ndcg_score, ndcg_scores, avg_latency = evaluate_with_retry(
-        queries_df, client, collection_name
+    avg_ndcg_score, ndcg_scores, avg_latency, api_calls_saved = evaluate_with_retry(
+        queries_df,
+        client,
+        collection_name,
+        f"out/rankings_{base_file_name}_{timestamp}.parquet" if save_rankings else None,
     )
     collection_info = client.get_collection(collection_name)
     num_documents = collection_info.num_documents  # Retrieve document count
@@ -99,18 +106,22 @@ def process_file(
             "avg_ndcg_score": avg_ndcg_score,
             "avg_latency": avg_latency,
             "num_docs": num_documents,
+            "num_queries": len(queries_df),
+            "api_calls_saved": api_calls_saved,
         }
     )
     # Store results for ndcg_scores DataFrame
     ndcg_scores_dict[base_file_name] = ndcg_scores
 
     print(f"Average NDCG@5 Score for {query_file}: {avg_ndcg_score:.4f}")
+    print(f"API calls saved by query deduplication: {api_calls_saved}")
 
 
 def main(
     n_rows: Optional[int],
     all_files: bool,
     collection_name: Optional[str],
+    save_rankings: bool = False,
 ) -> None:
     if not validate_api_key():
         print("Error: Invalid API key provided.")
@@ -119,12 +130,12 @@ def main(
     if all_files:
         for query_file, coll_name in zip(QUERY_FILES, COLLECTION_NAMES):
             print(f"\nProcessing {query_file} with collection {coll_name}...")
-            process_file(query_file, coll_name, n_rows)
+            process_file(query_file, coll_name, n_rows, save_rankings)
     elif collection_name:
         if collection_name in COLLECTION_NAMES:
             query_file = QUERY_FILES[COLLECTION_NAMES.index(collection_name)]
             print(f"\nProcessing {query_file} with collection {collection_name}...")
-            process_file(query_file, collection_name, n_rows)
+            process_file(query_file, collection_name, n_rows, save_rankings)
         else:
             print(
                 f"Error: {collection_name} is not in the list of available collections."
@@ -172,10 +183,40 @@ if __name__ == "__main__":
         type=str,
         help="Specify a collection name to process (should be one of the listed collections)",
     )
+    parser.add_argument(
+        "--save_rankings",
+        action="store_true",
+        help="Store the full ranked results of every query in out/rankings_<file>_<timestamp>.parquet",
+    )
+    parser.add_argument(
+        "--metrics_port",
+        type=int,
+        default=None,
+        help="Serve live Prometheus-format metrics on this local port (optional)",
+    )
+    parser.add_argument(
+        "--stats_file",
+        type=str,
+        default=None,
+        help="Periodically write a JSON snapshot of the live metrics to this file (optional)",
+    )
+    parser.add_argument(
+        "--stats_interval",
+        type=float,
+        default=10.0,
+        help="Seconds between stats file writes",
+    )
 
     args = parser.parse_args()
-    main(
-        args.n_rows,
-        args.all_files,
-        args.collection_name,
+    stop_metrics = start_live_metrics(
+        args.metrics_port, args.stats_file, args.stats_interval
     )
+    try:
+        main(
+            args.n_rows,
+            args.all_files,
+            args.collection_name,
+            args.save_rankings,
+        )
+    finally:
+        stop_metrics()
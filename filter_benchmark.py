@@ -0,0 +1,67 @@
+import argparse
+import os
+from datetime import datetime
+from typing import List, Optional
+import pandas as pd
+from src.client import get_colivara_client
+from src.filter_benchmark import SELECTIVITY_LEVELS, run_filter_benchmark, tag_collection
+
+timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# Ensure the output directory exists
+os.makedirs("out", exist_ok=True)
+
+
+def main(
+    collection_name: str,
+    levels: List[float],
+    n_rows: Optional[int],
+    top_k: int,
+) -> None:
+    client = get_colivara_client()
+
+    queries_df: pd.DataFrame = pd.read_pickle(f"data/queries/{collection_name}_queries.pkl")
+    queries_df.dropna(subset=["query"], inplace=True)
+    if n_rows is not None:
+        queries_df = queries_df.head(n_rows).copy()  # Create a copy to avoid warnings
+
+    print(f"\nTagging {collection_name} with selectivity levels {levels}...")
+    documents_metadata = tag_collection(client, collection_name, levels)
+
+    print(f"Searching {len(queries_df)} queries unfiltered and at each level...")
+    results = run_filter_benchmark(
+        client, queries_df, collection_name, documents_metadata, levels, top_k
+    )
+    print(results.to_string(index=False))
+
+    results.to_pickle(f"out/filter_benchmark_{collection_name}_{timestamp}.pkl")
+    print(f"Filter benchmark saved to out/filter_benchmark_{collection_name}_{timestamp}.pkl")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure how metadata-filtered search changes latency and NDCG."
+    )
+    parser.add_argument(
+        "--collection_name",
+        type=str,
+        required=True,
+        help="Collection to benchmark, e.g. arxivqa_test_subsampled",
+    )
+    parser.add_argument(
+        "--levels",
+        type=float,
+        nargs="+",
+        default=SELECTIVITY_LEVELS,
+        help="Filter selectivities in percent of the collection",
+    )
+    parser.add_argument(
+        "--n_rows",
+        type=int,
+        default=None,
+        help="Number of rows to load from query data (optional, loads all if not specified)",
+    )
+    parser.add_argument("--top_k", type=int, default=5, help="Number of top results to consider")
+
+    args = parser.parse_args()
+    main(args.collection_name, args.levels, args.n_rows, args.top_k)
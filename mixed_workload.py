@@ -0,0 +1,120 @@
+import argparse
+import os
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+from src.client import get_colivara_client
+from src.data_loader import load_data
+from src.mixed_workload import run_mixed_workload, summarize_mixed_workload
+
+timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# Ensure the output directory exists
+os.makedirs("out", exist_ok=True)
+
+
+def main(
+    search_collection: str,
+    ingest_dataset: str,
+    ingest_collection: Optional[str],
+    qps: float,
+    docs_per_second: Optional[float],
+    n_rows: Optional[int],
+    n_docs: Optional[int],
+    top_k: int,
+) -> None:
+    queries_df: pd.DataFrame = pd.read_pickle(f"data/queries/{search_collection}_queries.pkl")
+    queries_df.dropna(subset=["query"], inplace=True)
+    if n_rows is not None:
+        queries_df = queries_df.head(n_rows).copy()  # Create a copy to avoid warnings
+
+    ingest_df: pd.DataFrame = load_data(f"data/full/{ingest_dataset}.pkl")
+    if n_docs is not None:
+        ingest_df = ingest_df.head(n_docs).copy()
+    coll_name = ingest_collection or f"{ingest_dataset}_mixed_workload"
+
+    rate = f"{docs_per_second} docs/s" if docs_per_second else "full speed"
+    print(
+        f"\nSearching {search_collection} at {qps} QPS, alone and while ingesting "
+        f"{len(ingest_df)} documents into {coll_name} at {rate}..."
+    )
+    searches = run_mixed_workload(
+        get_colivara_client(),
+        queries_df,
+        search_collection,
+        ingest_df,
+        coll_name,
+        qps,
+        docs_per_second,
+        top_k,
+        ingest_client=get_colivara_client(),
+    )
+    summary = summarize_mixed_workload(searches)
+    ingest = searches.attrs["ingest"]
+
+    print(summary.to_string(index=False))
+    print(
+        f"\nIngested {ingest['documents']} of {len(ingest_df)} documents in {ingest['seconds']:.1f}s "
+        f"({ingest['documents'] / ingest['seconds']:.2f} docs/s)"
+    )
+    if ingest["error"]:
+        print(f"Ingest stopped early: {ingest['error']}")
+
+    searches.to_pickle(f"out/mixed_workload_{search_collection}_{timestamp}.pkl")
+    print(f"Per-search results saved to out/mixed_workload_{search_collection}_{timestamp}.pkl")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure search latency and NDCG with and without concurrent ingestion."
+    )
+    parser.add_argument(
+        "--search_collection",
+        type=str,
+        required=True,
+        help="Collection to search, e.g. arxivqa_test_subsampled",
+    )
+    parser.add_argument(
+        "--ingest_dataset",
+        type=str,
+        required=True,
+        help="Dataset to ingest during the loaded phase, e.g. docvqa_test_subsampled",
+    )
+    parser.add_argument(
+        "--ingest_collection",
+        type=str,
+        default=None,
+        help="Collection to ingest into (optional, defaults to <ingest_dataset>_mixed_workload)",
+    )
+    parser.add_argument("--qps", type=float, default=2.0, help="Searches started per second")
+    parser.add_argument(
+        "--docs_per_second",
+        type=float,
+        default=None,
+        help="Ingest rate in documents per second (optional, full speed if not specified)",
+    )
+    parser.add_argument(
+        "--n_rows",
+        type=int,
+        default=None,
+        help="Number of rows to load from query data (optional, loads all if not specified)",
+    )
+    parser.add_argument(
+        "--n_docs",
+        type=int,
+        default=None,
+        help="Number of documents to ingest (optional, ingests all if not specified)",
+    )
+    parser.add_argument("--top_k", type=int, default=5, help="Number of top results to consider")
+
+    args = parser.parse_args()
+    main(
+        args.search_collection,
+        args.ingest_dataset,
+        args.ingest_collection,
+        args.qps,
+        args.docs_per_second,
+        args.n_rows,
+        args.n_docs,
+        args.top_k,
+    )
@@ -0,0 +1,97 @@
+import argparse
+import os
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+from src.client import get_colivara_client
+from src.drift import collect_rankings, compare_runs, load_rankings, save_rankings
+
+timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# Ensure the output directory exists
+os.makedirs("out", exist_ok=True)
+
+
+def load_queries(queries_file: str, n_rows: Optional[int]) -> list:
+    """
+    Load query texts from a query pickle, or from a text file with one query per line.
+
+    Args:
+        queries_file (str): The query pickle (with a 'query' column) or text file.
+        n_rows (Optional[int]): Number of queries to load (all if None).
+
+    Returns:
+        list: The query texts.
+    """
+    if queries_file.endswith(".pkl"):
+        queries = pd.read_pickle(queries_file)["query"].dropna().tolist()
+    else:
+        with open(queries_file) as f:
+            queries = [line.strip() for line in f if line.strip()]
+    return queries[:n_rows] if n_rows is not None else queries
+
+
+def record(
+    queries_file: str, collection_name: str, top_k: int, n_rows: Optional[int], output: Optional[str]
+) -> None:
+    client = get_colivara_client()
+    queries = load_queries(queries_file, n_rows)
+    records = collect_rankings(client, queries, collection_name, top_k)
+    path = output or f"out/rankings_{collection_name}_{timestamp}.parquet"
+    save_rankings(records, path)
+    print(f"Rankings for {len(set(r['query'] for r in records))} queries saved to {path}")
+
+
+def compare(run_a: str, run_b: str, k: int, p: float) -> None:
+    per_query, summary = compare_runs(load_rankings(run_a), load_rankings(run_b), k, p)
+    print(f"\nRanking drift between {run_a} (A) and {run_b} (B) at k={k}:")
+    for name, value in summary.items():
+        print(f"  {name}: {value:.4f}" if isinstance(value, float) else f"  {name}: {value}")
+
+    print("\nQueries with the lowest rank-biased overlap:")
+    print(per_query.nsmallest(10, "rbo").to_string(index=False))
+    per_query.to_pickle(f"out/ranking_drift_{timestamp}.pkl")
+    print(f"Per-query drift saved to out/ranking_drift_{timestamp}.pkl")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Record ranked results and compare rankings between runs, without ground truth."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Search queries and store their rankings")
+    record_parser.add_argument(
+        "--queries_file",
+        type=str,
+        required=True,
+        help="Query pickle with a 'query' column, or a text file with one query per line",
+    )
+    record_parser.add_argument("--collection_name", type=str, required=True)
+    record_parser.add_argument("--top_k", type=int, default=10, help="Depth of the stored rankings")
+    record_parser.add_argument(
+        "--n_rows",
+        type=int,
+        default=None,
+        help="Number of queries to load (optional, loads all if not specified)",
+    )
+    record_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Parquet file to write (optional, defaults to out/rankings_<collection>_<timestamp>.parquet)",
+    )
+
+    compare_parser = subparsers.add_parser("compare", help="Compare the rankings of two runs")
+    compare_parser.add_argument("run_a", type=str, help="Rankings Parquet file of run A")
+    compare_parser.add_argument("run_b", type=str, help="Rankings Parquet file of run B")
+    compare_parser.add_argument("--k", type=int, default=10, help="Depth to compare at")
+    compare_parser.add_argument(
+        "--p", type=float, default=0.9, help="Rank-biased overlap persistence parameter"
+    )
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.queries_file, args.collection_name, args.top_k, args.n_rows, args.output)
+    else:
+        compare(args.run_a, args.run_b, args.k, args.p)
@@ -0,0 +1,101 @@
+import argparse
+import os
+from datetime import datetime
+from typing import List
+import pandas as pd
+from src.client import get_colivara_client
+from src.data_loader import load_data
+from src.late_interaction import (
+    build_page_cache,
+    build_query_cache,
+    evaluate_local,
+    load_embedding_cache,
+    maxsim_scores,
+)
+
+CACHE_DIR = "data/embeddings"
+
+timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# Ensure the output directory exists
+os.makedirs("out", exist_ok=True)
+
+
+def build_cache(dataset: str, n_rows: int = None) -> None:
+    """
+    Fetch query and page embeddings for a dataset from the API and cache them on disk.
+
+    Args:
+        dataset (str): Dataset name, e.g. "arxivqa_test_subsampled".
+        n_rows (int, optional): Number of query and page rows to embed. Embeds all if None.
+    """
+    client = get_colivara_client()
+
+    queries_df: pd.DataFrame = pd.read_pickle(f"data/queries/{dataset}_queries.pkl")
+    queries_df.dropna(subset=["query"], inplace=True)
+    if n_rows is not None:
+        queries_df = queries_df.head(n_rows).copy()
+    build_query_cache(client, queries_df, os.path.join(CACHE_DIR, dataset, "queries"))
+
+    df = load_data(f"data/full/{dataset}.pkl", nrows=n_rows)
+    build_page_cache(client, df, os.path.join(CACHE_DIR, dataset, "pages"))
+    print(f"Cached embeddings for {dataset} in {os.path.join(CACHE_DIR, dataset)}")
+
+
+def rescore(dataset: str, top_ks: List[int]) -> pd.DataFrame:
+    """
+    Score a cached dataset offline and compute NDCG for each top_k.
+
+    Args:
+        dataset (str): Dataset name, e.g. "arxivqa_test_subsampled".
+        top_ks (List[int]): The top_k values to evaluate.
+
+    Returns:
+        pd.DataFrame: One row per top_k with the mean NDCG score.
+    """
+    queries = load_embedding_cache(os.path.join(CACHE_DIR, dataset, "queries"))
+    pages = load_embedding_cache(os.path.join(CACHE_DIR, dataset, "pages"))
+    scores = maxsim_scores(queries, pages)
+
+    rows = []
+    for top_k in top_ks:
+        mean_ndcg, _ = evaluate_local(queries, pages, top_k=top_k, scores=scores)
+        rows.append({"dataset": dataset, "top_k": top_k, "avg_ndcg_score": mean_ndcg})
+        print(f"Local NDCG@{top_k} for {dataset}: {mean_ndcg:.4f}")
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-score cached late-interaction embeddings locally."
+    )
+    parser.add_argument(
+        "--dataset",
+        type=str,
+        required=True,
+        help="Dataset name, e.g. arxivqa_test_subsampled",
+    )
+    parser.add_argument(
+        "--build_cache",
+        action="store_true",
+        help="Fetch query and page embeddings from the API before scoring",
+    )
+    parser.add_argument(
+        "--n_rows",
+        type=int,
+        default=None,
+        help="Number of rows to embed when building the cache (optional, embeds all if not specified)",
+    )
+    parser.add_argument(
+        "--top_k",
+        type=int,
+        nargs="+",
+        default=[5],
+        help="One or more top_k values to evaluate",
+    )
+
+    args = parser.parse_args()
+    if args.build_cache:
+        build_cache(args.dataset, args.n_rows)
+    results_df = rescore(args.dataset, args.top_k)
+    results_df.to_pickle(f"out/local_ndcg_scores_{args.dataset}_{timestamp}.pkl")
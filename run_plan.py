@@ -0,0 +1,42 @@
+import argparse
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+from src.client import get_colivara_client
+from src.plan import execute_plan, load_plan
+
+timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+def endpoint_client(endpoint: Dict[str, Any]) -> Any:
+    """Build the client of a plan endpoint, reading its API key from the environment."""
+    return get_colivara_client(endpoint["base_url"], os.getenv(endpoint["api_key_env"]))
+
+
+def main(plan_file: str, max_workers: Optional[int]) -> None:
+    plan = load_plan(plan_file)
+    results = execute_plan(plan, endpoint_client, max_workers)
+    if results.empty:
+        print("No results yet.")
+        return
+
+    print(results.to_string(index=False))
+    summary_path = os.path.join(plan["output_dir"], f"summary_{timestamp}.pkl")
+    results.to_pickle(summary_path)
+    print(f"Plan summary saved to {summary_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the cells of a benchmark plan that have no results yet."
+    )
+    parser.add_argument("plan_file", type=str, help="JSON plan file, e.g. plans/example.json")
+    parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=None,
+        help="Maximum number of cells run at once (optional, defaults to the plan's max_workers)",
+    )
+
+    args = parser.parse_args()
+    main(args.plan_file, args.max_workers)
@@ -0,0 +1,130 @@
+import argparse
+import os
+from datetime import datetime
+from typing import List, Optional
+import pandas as pd
+from src.client import get_colivara_client
+from src.data_loader import load_data
+from src.scaling import fit_scaling_results, predict_growth, run_scaling_benchmark
+
+timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# Ensure the output directory exists
+os.makedirs("out", exist_ok=True)
+
+
+def parse_sizes(sizes: List[str], total: int) -> List[int]:
+    """
+    Turn the --sizes arguments into increasing collection sizes.
+
+    Args:
+        sizes (List[str]): Sizes as strings; "all" means every page in the dataset.
+        total (int): Number of pages in the dataset.
+
+    Returns:
+        List[int]: Distinct sizes, capped at `total`, in increasing order.
+    """
+    parsed = [total if size == "all" else min(int(size), total) for size in sizes]
+    return sorted(set(parsed))
+
+
+def main(
+    dataset: str,
+    sizes: List[str],
+    top_ks: List[int],
+    n_queries: int,
+    collection_name: Optional[str],
+    predict: List[int],
+    reset: bool,
+) -> None:
+    client = get_colivara_client()
+    df: pd.DataFrame = load_data(f"data/full/{dataset}.pkl")
+    queries_df: pd.DataFrame = pd.read_pickle(f"data/queries/{dataset}_queries.pkl")
+    queries_df.dropna(subset=["query"], inplace=True)
+    queries = (
+        queries_df["query"]
+        .drop_duplicates()
+        .sample(n=min(n_queries, queries_df["query"].nunique()), random_state=0)
+        .tolist()
+    )
+
+    coll_name = collection_name or f"{dataset}_scaling"
+    print(f"\nBuilding {coll_name} from {dataset} and searching {len(queries)} queries...")
+    results = run_scaling_benchmark(
+        client, df, queries, coll_name, parse_sizes(sizes, len(df)), top_ks, reset
+    )
+    fits = fit_scaling_results(results)
+
+    print(results.to_string(index=False))
+    print("\nGrowth curves (value = coefficient * num_documents ** exponent):")
+    print(fits.to_string(index=False))
+    if predict:
+        for _, fit in fits.iterrows():
+            predictions = predict_growth(fit, predict)
+            formatted = ", ".join(f"{n}: {v:.3f}" for n, v in zip(predict, predictions))
+            print(f"Predicted {fit['metric']} (top_k={fit['top_k']}) at {formatted}")
+
+    results.to_pickle(f"out/scaling_{dataset}_{timestamp}.pkl")
+    fits.to_pickle(f"out/scaling_fits_{dataset}_{timestamp}.pkl")
+    print(f"Scaling results saved to out/scaling_{dataset}_{timestamp}.pkl")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure how search latency and ingest throughput scale with collection size."
+    )
+    parser.add_argument(
+        "--dataset",
+        type=str,
+        required=True,
+        help="Dataset to build the collections from, e.g. tatdqa_test",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        nargs="+",
+        default=["100", "250", "500", "1000", "all"],
+        help="Collection sizes to measure at; 'all' means every page in the dataset",
+    )
+    parser.add_argument(
+        "--top_k",
+        type=int,
+        nargs="+",
+        default=[5],
+        help="One or more top_k values to search with",
+    )
+    parser.add_argument(
+        "--n_queries",
+        type=int,
+        default=50,
+        help="Size of the fixed query sample searched at every collection size",
+    )
+    parser.add_argument(
+        "--collection_name",
+        type=str,
+        help="Collection to build (optional, defaults to <dataset>_scaling)",
+    )
+    parser.add_argument(
+        "--predict",
+        type=int,
+        nargs="*",
+        default=[],
+        help="Collection sizes to predict latency and throughput at from the fitted curves",
+    )
+
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Delete and re-create the collection if it already holds documents",
+    )
+
+    args = parser.parse_args()
+    main(
+        args.dataset,
+        args.sizes,
+        args.top_k,
+        args.n_queries,
+        args.collection_name,
+        args.predict,
+        args.reset,
+    )
@@ -0,0 +1,182 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Tuple
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+from src.evaluator import get_search_results, group_queries, ndcg_at_k
+
+MODES = ("interleaved", "concurrent")
+
+
+def timed_search(
+    client: Any, query_text: str, collection_name: str, top_k: int
+) -> Tuple[Any, float]:
+    """
+    Search once and time it, falling back to the retrying search on failure.
+
+    Only a clean first attempt gives a comparable latency, so a search that needed
+    retries is returned with a NaN latency and left out of the latency comparison.
+
+    Args:
+        client (Any): Search client to retrieve results.
+        query_text (str): The search query.
+        collection_name (str): Name of the collection to search.
+        top_k (int): Number of top results to retrieve.
+
+    Returns:
+        Tuple[Any, float]: The search results (None if all retries failed) and the latency in seconds.
+    """
+    try:
+        start = time.time()
+        results = client.search(query=query_text, collection_name=collection_name, top_k=top_k)
+        latency = time.time() - start
+        if len(results.results) >= top_k:
+            return results, latency
+    except Exception:
+        pass
+    try:
+        return get_search_results(client, query_text, collection_name, top_k), float("nan")
+    except Exception as e:
+        print(f"Failed to retrieve results for query '{query_text}': {e}")
+        return None, float("nan")
+
+
+def evaluate_ab(
+    queries_df: pd.DataFrame,
+    client_a: Any,
+    client_b: Any,
+    collection_name: str,
+    top_k: int = 5,
+    mode: str = "interleaved",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Send every query to two endpoints back to back and record paired results.
+
+    In "interleaved" mode the two searches run one after the other, in a random
+    order per query, so drift in load or network affects both sides equally. In
+    "concurrent" mode they are sent at the same time. Identical queries share one
+    search per endpoint, as in `evaluate_rag_model`.
+
+    Args:
+        queries_df (pd.DataFrame): DataFrame containing queries and true document IDs.
+        client_a (Any): Search client of endpoint A.
+        client_b (Any): Search client of endpoint B.
+        collection_name (str): Name of the collection to search on both endpoints.
+        top_k (int, optional): Number of top results to consider. Defaults to 5.
+        mode (str, optional): "interleaved" or "concurrent". Defaults to "interleaved".
+        seed (int, optional): Seed for the interleaving order. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: One row per query with ndcg_a, ndcg_b, latency_a and latency_b.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {MODES}.")
+
+    rng = random.Random(seed)
+    query_texts = queries_df["query"].tolist()
+    true_doc_ids = queries_df["image_filename"].tolist()
+    rows = [None] * len(queries_df)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for group in tqdm(group_queries(queries_df), desc="A/B evaluating"):
+            query_text = query_texts[group[0]]
+            search = {
+                "a": lambda: timed_search(client_a, query_text, collection_name, top_k),
+                "b": lambda: timed_search(client_b, query_text, collection_name, top_k),
+            }
+            if mode == "concurrent":
+                futures = {side: pool.submit(fn) for side, fn in search.items()}
+                outcome = {side: future.result() for side, future in futures.items()}
+            else:
+                order = ["a", "b"] if rng.random() < 0.5 else ["b", "a"]
+                outcome = {side: search[side]() for side in order}
+
+            for i in group:
+                row = {"query": query_text, "first": "a" if mode == "concurrent" else order[0]}
+                for side, (results, latency) in outcome.items():
+                    row[f"ndcg_{side}"] = (
+                        ndcg_at_k(results.results, true_doc_ids[i], k=top_k) if results else 0.0
+                    )
+                    row[f"latency_{side}"] = latency
+                rows[i] = row
+    return pd.DataFrame(rows)
+
+
+def paired_difference(
+    a: np.ndarray,
+    b: np.ndarray,
+    confidence: float = 0.95,
+    n_bootstrap: int = 10000,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """
+    Estimate the mean of the paired differences b - a with a bootstrap confidence interval.
+
+    Pairs where either side is NaN are dropped.
+
+    Args:
+        a (np.ndarray): Per-query values from endpoint A.
+        b (np.ndarray): Per-query values from endpoint B, paired with `a`.
+        confidence (float, optional): Confidence level of the interval. Defaults to 0.95.
+        n_bootstrap (int, optional): Number of bootstrap resamples. Defaults to 10000.
+        seed (int, optional): Seed for the resampling. Defaults to 0.
+
+    Returns:
+        Dict[str, float]: Number of pairs, mean of A and B, mean difference and its interval.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    mask = ~(np.isnan(a) | np.isnan(b))
+    a, b = a[mask], b[mask]
+    if len(a) == 0:
+        nan = float("nan")
+        return {"n": 0, "mean_a": nan, "mean_b": nan, "mean_diff": nan, "ci_low": nan, "ci_high": nan}
+
+    diffs = b - a
+    rng = np.random.default_rng(seed)
+    samples = rng.integers(0, len(diffs), size=(n_bootstrap, len(diffs)))
+    boot_means = diffs[samples].mean(axis=1)
+    alpha = (1 - confidence) / 2
+    ci_low, ci_high = np.quantile(boot_means, [alpha, 1 - alpha])
+    return {
+        "n": int(len(diffs)),
+        "mean_a": float(a.mean()),
+        "mean_b": float(b.mean()),
+        "mean_diff": float(diffs.mean()),
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+    }
+
+
+def summarize_ab(results: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
+    """
+    Summarise paired A/B results for NDCG and latency.
+
+    NDCG is paired per row, since each row has its own target page. Rows with the
+    same query share one search per endpoint, so latency is paired once per unique
+    query; counting the copies would inflate `n` and narrow the interval.
+
+    An interval that excludes 0 means the endpoints differ at the given confidence.
+
+    Args:
+        results (pd.DataFrame): The output of `evaluate_ab`.
+        confidence (float, optional): Confidence level of the intervals. Defaults to 0.95.
+
+    Returns:
+        pd.DataFrame: One row per metric with the paired difference (B - A) and its interval.
+    """
+    rows = []
+    searches = results.drop_duplicates("query")
+    for metric, pairs in (("ndcg", results), ("latency", searches)):
+        summary = paired_difference(
+            pairs[f"{metric}_a"].to_numpy(), pairs[f"{metric}_b"].to_numpy(), confidence
+        )
+        summary["significant"] = bool(summary["ci_low"] > 0 or summary["ci_high"] < 0)
+        rows.append({"metric": metric, **summary})
+    return pd.DataFrame(rows)
@@ -5,16 +5,18 @@ import os
 # Load environment variables from .env file
 load_dotenv(override=True)
 
-def get_colivara_client() -> Colivara:
+def get_colivara_client(base_url: str = None, api_key: str = None) -> Colivara:
     """
     Initializes and returns a Colivara client.
 
+    :param base_url: Base URL of the API. Defaults to COLIVARA_BASE_URL.
+    :param api_key: API key for the API. Defaults to COLIVARA_API_KEY.
     :raises ConnectionError: If the client initialization fails.
     :return: An instance of Colivara client.
     """
 
-    API_KEY = os.getenv("COLIVARA_API_KEY")
-    BASE_URL = os.getenv("COLIVARA_BASE_URL")
+    API_KEY = api_key or os.getenv("COLIVARA_API_KEY")
+    BASE_URL = base_url or os.getenv("COLIVARA_BASE_URL")
 
     if not API_KEY or not BASE_URL:
         raise EnvironmentError(
@@ -1,11 +1,68 @@
+import glob
+import hashlib
+import json
+import os
 import pandas as pd
+from typing import Any, List, Optional
 
+MANIFEST_FILE = "manifest.json"
+
+
+def resolve_parts_dir(file_path: str) -> Optional[str]:
+    """
+    Return the part-file directory holding a dataset, or None for a plain pickle file.
+
+    Args:
+        file_path (str): A pickle file path, or a dataset directory.
+
+    Returns:
+        Optional[str]: The directory containing the dataset's part files, if any.
+    """
+    if os.path.isdir(file_path):
+        return file_path
+    root, ext = os.path.splitext(file_path)
+    if not os.path.exists(file_path) and ext == ".pkl" and os.path.isdir(root):
+        return root
+    return None
+
+
+def list_parts(parts_dir: str) -> List[str]:
+    """
+    Return the dataset part files in a directory, in order.
+
+    If the directory has a manifest written by `download_datasets`, only the parts
+    it lists are returned, so leftover part files from an earlier run are ignored.
+
+    Args:
+        parts_dir (str): The directory containing the dataset's part files.
+
+    Returns:
+        List[str]: The part file paths.
+
+    Raises:
+        RuntimeError: If the manifest marks the download as incomplete.
+    """
+    manifest_path = os.path.join(parts_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return sorted(glob.glob(os.path.join(parts_dir, "part-*.pkl")))
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if not manifest.get("complete"):
+        raise RuntimeError(
+            f"The dataset in {parts_dir} is incomplete ({manifest.get('num_rows', 0)} rows "
+            "downloaded); run download_datasets.py again to finish it."
+        )
+    return [os.path.join(parts_dir, part["file"]) for part in manifest["parts"]]
 
 
 def read_pickle_file(file_path: str) -> pd.DataFrame:
     """
     Read a pickle file and return a dataframe.
 
+    Datasets written by `download_datasets` are stored as a directory of part files;
+    if `file_path` is such a directory, or a missing "<name>.pkl" next to one, the
+    parts listed in its manifest are read in order and concatenated.
+
     Args:
         file_path (str): The path to the pickle file.
 
@@ -14,10 +71,19 @@ def read_pickle_file(file_path: str) -> pd.DataFrame:
 
     Raises:
         FileNotFoundError: If the file at the specified path is not found.
-        RuntimeError: If there is an error loading the data.
+        RuntimeError: If there is an error loading the data, or the dataset's download
+            is incomplete.
     """
+    parts_dir = resolve_parts_dir(file_path)
     try:
-        return pd.read_pickle(file_path).reset_index().rename(columns={"index": "id"})
+        if parts_dir is not None:
+            df = pd.concat(
+                [pd.read_pickle(part) for part in list_parts(parts_dir)],
+                ignore_index=True,
+            )
+        else:
+            df = pd.read_pickle(file_path)
+        return df.reset_index().rename(columns={"index": "id"})
     except FileNotFoundError:
         raise FileNotFoundError(f"The file at {file_path} was not found.")
     except Exception as e:
@@ -44,3 +110,49 @@ def process_data(df: pd.DataFrame, nrows: int = None) -> pd.DataFrame:
 def load_data(file_path: str, nrows: int = None) -> pd.DataFrame:
     df = read_pickle_file(file_path)
     return process_data(df, nrows)
+
+
+def image_content_hash(image: Any) -> str:
+    """
+    Compute a content hash for a page image.
+
+    Args:
+        image (Any): A PIL image, or a huggingface-style dict holding raw ``bytes``.
+
+    Returns:
+        str: The SHA-256 hex digest of the image content.
+    """
+    hasher = hashlib.sha256()
+    if isinstance(image, dict):
+        hasher.update(image["bytes"])
+    elif isinstance(image, (bytes, bytearray)):
+        hasher.update(image)
+    else:
+        # hash the decoded pixels so that the same page re-encoded differently still matches
+        hasher.update(f"{image.mode}:{image.size}".encode())
+        hasher.update(image.tobytes())
+    return hasher.hexdigest()
+
+
+def deduplicate_pages(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Collapse rows that share the same page image into a single row.
+
+    The first occurrence of each distinct image is kept, and every image filename
+    pointing at that image is collected into an 'image_filenames' column so the
+    relevance check can still match any of them.
+
+    Args:
+        df (pd.DataFrame): DataFrame with 'image' and 'image_filename' columns.
+
+    Returns:
+        pd.DataFrame: One row per distinct page, with 'image_hash' and 'image_filenames' columns.
+    """
+    df = df.copy()
+    df["image_hash"] = df["image"].map(image_content_hash)
+    filenames = df.groupby("image_hash", sort=False)["image_filename"].agg(
+        lambda names: list(dict.fromkeys(names))
+    )
+    deduped = df.drop_duplicates(subset="image_hash", keep="first").reset_index(drop=True)
+    deduped["image_filenames"] = deduped["image_hash"].map(filenames)
+    return deduped
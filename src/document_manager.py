@@ -1,9 +1,12 @@
 from tqdm import tqdm
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 from tenacity import retry, stop_after_attempt, wait_fixed
 import base64
 from io import BytesIO
+import time
+from src.metrics import REGISTRY, retry_labels
+from src.ingest_profile import image_dimensions, save_profile
 
 def check_collection(client: Any, collection_name: str) -> bool:
     """
@@ -21,9 +24,31 @@ def check_collection(client: Any, collection_name: str) -> bool:
 
 
 
+def encode_image_base64(pil_image: Any) -> str:
+    """
+    Encode a page image as a base64 PNG string.
+
+    Args:
+        pil_image (Any): The image, e.g. <PIL.PngImagePlugin.PngImageFile image mode=RG...
+
+    Returns:
+        str: The base64-encoded PNG.
+    """
+    buffered = BytesIO()
+    pil_image.save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode()
+
+
 # if a job failed midway - you can manually adjust start_idx
 def upsert_documents(
-    client: Any, df: pd.DataFrame, collection_name: str, start_idx: int = 0
+    client: Any,
+    df: pd.DataFrame,
+    collection_name: str,
+    start_idx: int = 0,
+    profile_path: Optional[str] = None,
+    measure_index_wait: bool = False,
+    docs_per_second: Optional[float] = None,
+    on_upserted: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Upsert documents into a specified collection in the client's database.
@@ -32,35 +57,183 @@ def upsert_documents(
         client (Any): The database client.
         df (pd.DataFrame): DataFrame containing document metadata and base64 images.
         collection_name (str): The name of the collection to upsert documents into.
+            If the DataFrame has an 'image_filenames' column (see `deduplicate_pages`),
+            all filenames are stored in the 'image_file_names' metadata field.
+        start_idx (int, optional): Row to start from. Defaults to 0.
+        profile_path (Optional[str], optional): Parquet file to append one ingest record
+            per document to: pixel dimensions, encoded bytes, and encode, upload and
+            indexing time. Not written if None.
+        measure_index_wait (bool, optional): Upload without waiting and then poll until the
+            document is indexed, so upload and indexing time are recorded separately. An
+            existing document of the same name is deleted first, since polling would otherwise
+            find the old version at once. Otherwise the server waits and both are recorded as
+            upload time. Defaults to False.
+        docs_per_second (Optional[float], optional): Start at most this many documents per
+            second, on a fixed schedule from the first document. Unpaced if None.
+        on_upserted (Optional[Callable[[Dict[str, Any]], None]], optional): Called with the
+            ingest record of each document once it is upserted, e.g. to track progress.
 
     Returns:
         List[Dict[str, Any]]: List of documents in the collection after upserting.
     """
     if not check_collection(client, collection_name):
         client.create_collection(collection_name)
-    for i in tqdm(range(start_idx, len(df)), desc="Upserting documents"):
-        # convert image to base64. image looks like this: <PIL.PngImagePlugin.PngImageFile image mode=RG...
-        pil_image = df.iloc[i]["image"]
-        buffered = BytesIO()
-        pil_image.save(buffered, format="PNG")
-        # the reason why do this here, instead of in the data_loader.py, 
-        # is because we want to avoid manipulating the dataset coming from huggingface datasets
-        base64_image = base64.b64encode(buffered.getvalue()).decode()
+    labels = {"collection": collection_name}
+    records = []
+    start = time.time()
+    try:
+        for n, i in enumerate(tqdm(range(start_idx, len(df)), desc="Upserting documents")):
+            if docs_per_second:
+                time.sleep(max(0.0, start + n / docs_per_second - time.time()))
+            record = upsert_row(
+                client, df, i, collection_name, labels, measure_index_wait
+            )
+            records.append(record)
+            if on_upserted:
+                on_upserted(record)
+    finally:
+        if profile_path and records:
+            save_profile(records, profile_path)
+    return client.list_documents(collection_name)
+
+
+def upsert_row(
+    client: Any,
+    df: pd.DataFrame,
+    i: int,
+    collection_name: str,
+    labels: Dict[str, str],
+    measure_index_wait: bool = False,
+) -> Dict[str, Any]:
+    """
+    Encode and upsert row i of the DataFrame, timing each stage.
+
+    Args:
+        client (Any): The database client.
+        df (pd.DataFrame): DataFrame containing document metadata and images.
+        i (int): The row to upsert.
+        collection_name (str): The name of the collection to upsert the document into.
+        labels (Dict[str, str]): Labels for the live metrics.
+        measure_index_wait (bool, optional): Time the upload and the indexing separately,
+            after deleting any existing version of the document.
+
+    Returns:
+        Dict[str, Any]: The ingest record of the document.
+    """
+    image = df.iloc[i]["image"]
+    name = str(df.iloc[i]["id"])
+    start = time.time()
+    # the reason why do this here, instead of in the data_loader.py,
+    # is because we want to avoid manipulating the dataset coming from huggingface datasets
+    base64_image = encode_image_base64(image)
+    encode_seconds = time.time() - start
+    metadata = {
+        "doc_id": name,
+        "image_file_name": df["image_filename"][i],
+    }
+    # deduplicated pages carry every filename that maps to the same image
+    if "image_filenames" in df.columns:
+        metadata["image_file_names"] = list(df["image_filenames"][i])
+
+    if measure_index_wait:
+        delete_existing_document(client, name, collection_name)
+
+    REGISTRY.add("ingest_in_flight_requests", 1, labels)
+    start = time.time()
+    index_wait_seconds = float("nan")
+    try:
         upsert_document(
-            name=str(df.iloc[i]["id"]),
+            name=name,
             base64_image=base64_image,
-            metadata={
-                "doc_id": str(df.iloc[i]["id"]),
-                "image_file_name": df["image_filename"][i],
-            },
+            metadata=metadata,
             collection_name=collection_name,
             client=client,
+            wait=not measure_index_wait,
         )
-    return client.list_documents(collection_name)
+        upload_seconds = time.time() - start
+        if measure_index_wait:
+            wait_for_document(client, name, collection_name)
+            index_wait_seconds = time.time() - start - upload_seconds
+    except Exception:
+        REGISTRY.inc("ingest_errors_total", labels=labels)
+        raise
+    finally:
+        REGISTRY.add("ingest_in_flight_requests", -1, labels)
+    upsert_seconds = time.time() - start
+    REGISTRY.observe("ingest_upsert_latency_seconds", upsert_seconds, labels)
+    REGISTRY.inc("ingest_documents_total", labels=labels)
+    REGISTRY.mark("ingest_documents", labels)
+
+    return {
+        "doc_id": name,
+        "image_filename": metadata["image_file_name"],
+        **image_dimensions(image),
+        # base64 inflates the PNG by 4/3; report the bytes of the PNG itself
+        "encoded_bytes": len(base64_image) * 3 // 4,
+        "encode_seconds": encode_seconds,
+        "upload_seconds": upload_seconds,
+        "index_wait_seconds": index_wait_seconds,
+        "total_seconds": encode_seconds + upsert_seconds,
+    }
 
 
-@retry(stop=stop_after_attempt(5), wait=wait_fixed(2))
-def upsert_document(name, base64_image, metadata, collection_name, client):
+def delete_existing_document(client: Any, name: str, collection_name: str) -> None:
+    """
+    Delete a document if it exists, so a new upload can be told apart from the old one.
+
+    Args:
+        client (Any): The database client.
+        name (str): The name of the document.
+        collection_name (str): The collection the document may be in.
+    """
+    try:
+        client.get_document(name, collection_name=collection_name)
+    except Exception:
+        return  # does not exist
+    client.delete_document(name, collection_name=collection_name)
+
+
+def wait_for_document(
+    client: Any,
+    name: str,
+    collection_name: str,
+    timeout: float = 600.0,
+    poll_interval: float = 0.5,
+) -> None:
+    """
+    Poll until an upserted document has been indexed.
+
+    A document counts as indexed once it can be fetched and has pages, so an older
+    version of it must have been deleted first (see `delete_existing_document`).
+
+    Args:
+        client (Any): The database client.
+        name (str): The name of the document.
+        collection_name (str): The collection the document was upserted into.
+        timeout (float, optional): Seconds to wait before giving up. Defaults to 600.
+        poll_interval (float, optional): Seconds between polls. Defaults to 0.5.
+
+    Raises:
+        TimeoutError: If the document is not indexed within the timeout.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            document = client.get_document(name, collection_name=collection_name)
+            if document and document.num_pages:
+                return
+        except Exception:
+            pass  # not created yet
+        time.sleep(poll_interval)
+    raise TimeoutError(f"Document {name} was not indexed in {collection_name} within {timeout}s.")
+
+
+@retry(
+    stop=stop_after_attempt(5),
+    wait=wait_fixed(2),
+    before_sleep=lambda rs: REGISTRY.inc("ingest_retries_total", labels=retry_labels(rs, 3)),
+)
+def upsert_document(name, base64_image, metadata, collection_name, client, wait=True):
     """
     Upsert a single document into the specified collection in the client's database.
 
@@ -70,14 +243,15 @@ def upsert_document(name, base64_image, metadata, collection_name, client):
         metadata (Dict[str, Any]): Metadata for the document.
         collection_name (str): The name of the collection to upsert the document into.
         client (Any): The database client.
+        wait (bool, optional): Wait for the server to index the document. Defaults to True.
     """
-    
+
     success = client.upsert_document(
         name=name,
         document_base64=base64_image,
         metadata=metadata,
         collection_name=collection_name,
-        wait=True,
+        wait=wait,
     )
 
     if not success:
@@ -1,4 +1,9 @@
+import argparse
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 from datasets import load_dataset
 import pandas as pd
 
@@ -18,18 +23,155 @@ DATASETS = [
 ]
 
 OUTPUT_DIR = "data/full"
+MANIFEST_FILE = "manifest.json"
+BATCH_SIZE = 100
 
 
-def download_datasets():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    for i, dataset in enumerate(DATASETS):
-        dataset = load_dataset(dataset)
-        df = pd.DataFrame(dataset["test"])
-        file_name = DATASETS[i].split("/")[1]
-        output_path = os.path.join(OUTPUT_DIR, f"{file_name}.pkl")
-        df.to_pickle(output_path)
-        print(f"Saved dataset to {output_path}")
+def file_sha256(path: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in blocks."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def read_manifest(dataset_dir: str) -> Dict[str, Any]:
+    """
+    Read a dataset's manifest, or return an empty one if there is none.
+
+    Args:
+        dataset_dir (str): The directory the dataset parts are written to.
+
+    Returns:
+        Dict[str, Any]: The manifest.
+    """
+    path = os.path.join(dataset_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"complete": False, "num_rows": 0, "parts": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(dataset_dir: str, manifest: Dict[str, Any]) -> None:
+    """Atomically write a dataset's manifest."""
+    path = os.path.join(dataset_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def verify_parts(dataset_dir: str, manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return the leading parts of the manifest whose files exist and match their hashes.
+
+    Args:
+        dataset_dir (str): The directory the dataset parts are written to.
+        manifest (Dict[str, Any]): The dataset's manifest.
+
+    Returns:
+        List[Dict[str, Any]]: The verified parts, up to the first missing or corrupt one.
+    """
+    verified = []
+    for part in manifest["parts"]:
+        path = os.path.join(dataset_dir, part["file"])
+        if not os.path.exists(path) or file_sha256(path) != part["sha256"]:
+            break
+        verified.append(part)
+    return verified
+
+
+def remove_stale_parts(dataset_dir: str, parts: List[Dict[str, Any]]) -> None:
+    """Delete the part files in a dataset directory that are not among the given parts."""
+    keep = {part["file"] for part in parts}
+    for name in os.listdir(dataset_dir):
+        if name.startswith("part-") and name not in keep:
+            os.remove(os.path.join(dataset_dir, name))
+
+
+def download_dataset(
+    dataset_name: str, output_dir: str = OUTPUT_DIR, batch_size: int = BATCH_SIZE
+) -> Dict[str, Any]:
+    """
+    Stream a dataset's test split to disk in row batches, resuming where it left off.
+
+    Each batch is pickled as its own part file and recorded in the manifest with
+    its row count and SHA-256 hash. A complete dataset whose parts all verify is
+    skipped; an interrupted one resumes after its last verified part, once the
+    part files past it have been deleted.
+
+    Args:
+        dataset_name (str): The huggingface dataset name, e.g. "vidore/tatdqa_test".
+        output_dir (str, optional): The directory to write datasets into.
+        batch_size (int, optional): Number of rows per part file.
+
+    Returns:
+        Dict[str, Any]: The dataset's final manifest.
+    """
+    dataset_dir = os.path.join(output_dir, dataset_name.split("/")[1])
+    os.makedirs(dataset_dir, exist_ok=True)
+
+    manifest = read_manifest(dataset_dir)
+    verified = verify_parts(dataset_dir, manifest)
+    if manifest["complete"] and len(verified) == len(manifest["parts"]):
+        print(f"Skipping {dataset_name}: already downloaded ({manifest['num_rows']} rows)")
+        return manifest
+
+    manifest = {
+        "dataset": dataset_name,
+        "split": "test",
+        "complete": False,
+        "num_rows": sum(part["rows"] for part in verified),
+        "parts": verified,
+    }
+    write_manifest(dataset_dir, manifest)
+    remove_stale_parts(dataset_dir, verified)
+
+    stream = load_dataset(dataset_name, split="test", streaming=True)
+    if manifest["num_rows"]:
+        print(f"Resuming {dataset_name} from row {manifest['num_rows']}")
+        stream = stream.skip(manifest["num_rows"])
+
+    for batch in stream.iter(batch_size=batch_size):
+        part_file = f"part-{len(manifest['parts']):05d}.pkl"
+        part_path = os.path.join(dataset_dir, part_file)
+        df = pd.DataFrame(batch)
+        df.to_pickle(f"{part_path}.tmp")
+        os.replace(f"{part_path}.tmp", part_path)
+
+        manifest["parts"].append(
+            {"file": part_file, "rows": len(df), "sha256": file_sha256(part_path)}
+        )
+        manifest["num_rows"] += len(df)
+        write_manifest(dataset_dir, manifest)
+
+    manifest["complete"] = True
+    write_manifest(dataset_dir, manifest)
+    print(f"Saved {dataset_name} ({manifest['num_rows']} rows) to {dataset_dir}")
+    return manifest
+
+
+def download_datasets(max_workers: int = 4, output_dir: str = OUTPUT_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            dataset: pool.submit(download_dataset, dataset, output_dir)
+            for dataset in DATASETS
+        }
+    for dataset, future in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Failed to download {dataset}: {e}")
 
 
 if __name__ == "__main__":
-    download_datasets()
+    parser = argparse.ArgumentParser(description="Download the ViDoRe benchmark datasets.")
+    parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=4,
+        help="Number of datasets to download in parallel",
+    )
+    args = parser.parse_args()
+    download_datasets(args.max_workers)
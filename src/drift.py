@@ -0,0 +1,275 @@
+import os
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from tenacity import retry, stop_after_attempt, wait_fixed
+from tqdm import tqdm
+
+RANKING_COLUMNS = [
+    "query",
+    "rank",
+    "document_name",
+    "page_number",
+    "image_file_name",
+    "raw_score",
+]
+
+
+def ranking_records(query_text: str, results: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Flatten one query's ranked search results into records.
+
+    Search returns pages, so a multi-page document can fill several ranks; the
+    page number is recorded so each ranked item can be identified.
+
+    Args:
+        query_text (str): The search query.
+        results (List[Any]): The ranked search results.
+
+    Returns:
+        List[Dict[str, Any]]: One record per result, with its 1-based rank.
+    """
+    return [
+        {
+            "query": query_text,
+            "rank": rank,
+            "document_name": str(result.document_name),
+            "page_number": getattr(result, "page_number", None),
+            "image_file_name": (result.document_metadata or {}).get("image_file_name"),
+            "raw_score": float(result.raw_score),
+        }
+        for rank, result in enumerate(results, start=1)
+    ]
+
+
+def save_rankings(records: List[Dict[str, Any]], path: str) -> pd.DataFrame:
+    """
+    Write ranking records to a Parquet file.
+
+    Args:
+        records (List[Dict[str, Any]]): Records from `ranking_records`.
+        path (str): The Parquet file to write.
+
+    Returns:
+        pd.DataFrame: The stored rankings.
+    """
+    rankings = pd.DataFrame(records, columns=RANKING_COLUMNS)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    rankings.to_parquet(path, index=False)
+    return rankings
+
+
+def load_rankings(path: str) -> pd.DataFrame:
+    """
+    Load ranking records written by `save_rankings`.
+
+    Args:
+        path (str): The Parquet file.
+
+    Returns:
+        pd.DataFrame: The rankings.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The rankings at {path} were not found.")
+    return pd.read_parquet(path)
+
+
+@retry(stop=stop_after_attempt(8), wait=wait_fixed(3))
+def search_with_retry(client: Any, query_text: str, collection_name: str, top_k: int) -> Any:
+    """Search with the same retry policy as the evaluator, without requiring full results."""
+    return client.search(query=query_text, collection_name=collection_name, top_k=top_k)
+
+
+def collect_rankings(
+    client: Any, queries: List[str], collection_name: str, top_k: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Record the ranked results of unlabelled queries.
+
+    Args:
+        client (Any): Search client to retrieve results.
+        queries (List[str]): The query texts; duplicates are searched once.
+        collection_name (str): Name of the collection to search.
+        top_k (int, optional): Number of results to record per query. Defaults to 10.
+
+    Returns:
+        List[Dict[str, Any]]: Ranking records for `save_rankings`.
+    """
+    records = []
+    for query_text in tqdm(list(dict.fromkeys(queries)), desc="Recording rankings"):
+        try:
+            results = search_with_retry(client, query_text, collection_name, top_k)
+            records.extend(ranking_records(query_text, results.results))
+        except Exception as e:
+            print(f"Failed to retrieve results for query '{query_text}': {e}")
+    return records
+
+
+def _item_keys(rankings: pd.DataFrame) -> pd.Series:
+    """Identify each ranked page by document name and page number, if recorded."""
+    names = rankings["document_name"].astype(str)
+    if "page_number" not in rankings.columns:
+        return names
+    return names + "#" + rankings["page_number"].astype(str)
+
+
+def ranking_matrices(
+    rankings_a: pd.DataFrame, rankings_b: pd.DataFrame, k: int
+) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Align two runs on their common queries as dense (queries, k) matrices.
+
+    Ranked items are pages, keyed by document name and page number (rankings saved
+    without page numbers fall back to the document name), and encoded as integer
+    codes shared by both runs. Missing ranks are -1 in the code matrices and NaN in
+    the score matrices; an item repeated within one query's ranking is kept only at
+    its first rank, so the overlap metrics stay within [0, 1].
+
+    Args:
+        rankings_a (pd.DataFrame): Rankings of run A.
+        rankings_b (pd.DataFrame): Rankings of run B.
+        k (int): The depth to compare at.
+
+    Returns:
+        Tuple: The common queries, then the document codes and scores of A, then of B.
+    """
+    queries = sorted(set(rankings_a["query"]) & set(rankings_b["query"]))
+    rankings_a = rankings_a.assign(item=_item_keys(rankings_a))
+    rankings_b = rankings_b.assign(item=_item_keys(rankings_b))
+    _, vocabulary = pd.factorize(pd.concat([rankings_a["item"], rankings_b["item"]]))
+
+    def to_matrices(rankings: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        rankings = rankings[(rankings["rank"] <= k) & rankings["query"].isin(queries)]
+        rankings = rankings.sort_values("rank")
+        rows = pd.Index(queries).get_indexer(rankings["query"])
+        cols = rankings["rank"].to_numpy() - 1
+        item_codes = vocabulary.get_indexer(rankings["item"])
+        item_codes[rankings.duplicated(["query", "item"]).to_numpy()] = -1
+        codes = np.full((len(queries), k), -1, dtype=np.int64)
+        scores = np.full((len(queries), k), np.nan)
+        codes[rows, cols] = item_codes
+        scores[rows, cols] = rankings["raw_score"].to_numpy()
+        return codes, scores
+
+    codes_a, scores_a = to_matrices(rankings_a)
+    codes_b, scores_b = to_matrices(rankings_b)
+    return queries, codes_a, scores_a, codes_b, scores_b
+
+
+def overlap_at_depth(codes_a: np.ndarray, codes_b: np.ndarray) -> np.ndarray:
+    """
+    Count the documents shared by the top-d of both rankings, for every depth d.
+
+    Args:
+        codes_a (np.ndarray): (queries, k) document codes of run A, -1 for missing.
+        codes_b (np.ndarray): (queries, k) document codes of run B, -1 for missing.
+
+    Returns:
+        np.ndarray: (queries, k) overlap counts; column d-1 holds the overlap at depth d.
+    """
+    matches = (codes_a[:, :, None] == codes_b[:, None, :]) & (codes_a[:, :, None] >= 0)
+    cumulative = matches.cumsum(axis=1).cumsum(axis=2)
+    depth = np.arange(codes_a.shape[1])
+    return cumulative[:, depth, depth]
+
+
+def rank_biased_overlap(codes_a: np.ndarray, codes_b: np.ndarray, p: float = 0.9) -> np.ndarray:
+    """
+    Compute the extrapolated rank-biased overlap of every pair of rankings.
+
+    RBO weights agreement at the top more heavily: `p` is the probability of
+    looking one rank further. 1 means identical rankings, 0 disjoint ones.
+
+    Args:
+        codes_a (np.ndarray): (queries, k) document codes of run A.
+        codes_b (np.ndarray): (queries, k) document codes of run B.
+        p (float, optional): Persistence parameter. Defaults to 0.9.
+
+    Returns:
+        np.ndarray: The RBO of each query.
+    """
+    k = codes_a.shape[1]
+    depths = np.arange(1, k + 1)
+    agreement = overlap_at_depth(codes_a, codes_b) / depths
+    weights = p**depths
+    return agreement[:, -1] * p**k + (1 - p) / p * (agreement * weights).sum(axis=1)
+
+
+def jaccard_at_k(codes_a: np.ndarray, codes_b: np.ndarray) -> np.ndarray:
+    """
+    Compute the Jaccard similarity of the top-k document sets of every pair of rankings.
+
+    Args:
+        codes_a (np.ndarray): (queries, k) document codes of run A.
+        codes_b (np.ndarray): (queries, k) document codes of run B.
+
+    Returns:
+        np.ndarray: The Jaccard@k of each query (1 if both are empty).
+    """
+    intersection = overlap_at_depth(codes_a, codes_b)[:, -1]
+    union = (codes_a >= 0).sum(axis=1) + (codes_b >= 0).sum(axis=1) - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1), 1.0)
+
+
+def ks_statistic(a: np.ndarray, b: np.ndarray) -> float:
+    """Two-sample Kolmogorov-Smirnov statistic: the largest gap between the two empirical CDFs."""
+    a = np.sort(a[~np.isnan(a)])
+    b = np.sort(b[~np.isnan(b)])
+    if len(a) == 0 or len(b) == 0:
+        return float("nan")
+    values = np.concatenate([a, b])
+    cdf_a = np.searchsorted(a, values, side="right") / len(a)
+    cdf_b = np.searchsorted(b, values, side="right") / len(b)
+    return float(np.abs(cdf_a - cdf_b).max())
+
+
+def compare_runs(
+    rankings_a: pd.DataFrame, rankings_b: pd.DataFrame, k: int = 10, p: float = 0.9
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Compare the rankings of two runs without ground truth.
+
+    Args:
+        rankings_a (pd.DataFrame): Rankings of run A.
+        rankings_b (pd.DataFrame): Rankings of run B.
+        k (int, optional): The depth to compare at. Defaults to 10.
+        p (float, optional): RBO persistence parameter. Defaults to 0.9.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, float]]: Per-query RBO, Jaccard@k, top-1 change and
+            score shifts, and a summary over all common queries.
+    """
+    queries, codes_a, scores_a, codes_b, scores_b = ranking_matrices(rankings_a, rankings_b, k)
+    rbo = rank_biased_overlap(codes_a, codes_b, p)
+    jaccard = jaccard_at_k(codes_a, codes_b)
+    top1_changed = codes_a[:, 0] != codes_b[:, 0]
+    per_query = pd.DataFrame(
+        {
+            "query": queries,
+            "rbo": rbo,
+            "jaccard": jaccard,
+            "top1_changed": top1_changed,
+            "top1_score_delta": scores_b[:, 0] - scores_a[:, 0],
+            "mean_score_delta": np.nanmean(scores_b, axis=1) - np.nanmean(scores_a, axis=1),
+        }
+    )
+
+    summary = {
+        "num_queries": len(queries),
+        "only_in_a": len(set(rankings_a["query"]) - set(queries)),
+        "only_in_b": len(set(rankings_b["query"]) - set(queries)),
+        "mean_rbo": float(rbo.mean()) if len(queries) else float("nan"),
+        "mean_jaccard": float(jaccard.mean()) if len(queries) else float("nan"),
+        "top1_change_rate": float(top1_changed.mean()) if len(queries) else float("nan"),
+        "mean_top1_score_delta": float(np.nanmean(per_query["top1_score_delta"]))
+        if len(queries)
+        else float("nan"),
+        "top1_score_ks": ks_statistic(scores_a[:, 0], scores_b[:, 0]),
+        "all_scores_ks": ks_statistic(scores_a.ravel(), scores_b.ravel()),
+    }
+    return per_query, summary
@@ -1,8 +1,10 @@
 import numpy as np
-from typing import List, Any, Tuple
+from typing import List, Any, Tuple, Dict, Optional
 from tqdm import tqdm
 import time
 from tenacity import retry, stop_after_attempt, wait_fixed
+from src.metrics import REGISTRY, retry_labels
+from src.drift import ranking_records, save_rankings
 
 
 def dcg(scores: List[float]) -> float:
@@ -18,6 +20,27 @@ def dcg(scores: List[float]) -> float:
     return sum(rel / np.log2(idx + 2) for idx, rel in enumerate(scores))
 
 
+def is_relevant(document_metadata: Dict[str, Any], true_doc_id: Any) -> bool:
+    """
+    Check whether a search result's metadata points at the true document.
+
+    Deduplicated pages store every filename that maps to them in 'image_file_names',
+    so a page matches if the true filename is its primary filename or any of those.
+
+    Args:
+        document_metadata (Dict[str, Any]): The metadata attached to the search result.
+        true_doc_id (Any): The filename of the true document.
+
+    Returns:
+        bool: True if the result is the true document, False otherwise.
+    """
+    true_doc_id = str(true_doc_id)
+    document_metadata = document_metadata or {}
+    if document_metadata.get("image_file_name") == true_doc_id:
+        return True
+    return true_doc_id in document_metadata.get("image_file_names", [])
+
+
 def ndcg_at_k(results: List[Any], true_doc_id: int, k: int = 5) -> float:
     """
     Calculate the Normalized Discounted Cumulative Gain (NDCG) at rank k.
@@ -32,7 +55,7 @@ def ndcg_at_k(results: List[Any], true_doc_id: int, k: int = 5) -> float:
     """
     relevance_scores = [
         result.raw_score
-        if result.document_metadata["image_file_name"] == str(true_doc_id)
+        if is_relevant(result.document_metadata, true_doc_id)
         else 0
         for result in results[:k]
     ]
@@ -42,7 +65,13 @@ def ndcg_at_k(results: List[Any], true_doc_id: int, k: int = 5) -> float:
     return dcg_score / idcg_score if idcg_score else 0
 
 
-@retry(stop=stop_after_attempt(8), wait=wait_fixed(3))
+@retry(
+    stop=stop_after_attempt(8),
+    wait=wait_fixed(3),
+    before_sleep=lambda rs: REGISTRY.inc(
+        "evaluator_search_retries_total", labels=retry_labels(rs, 2)
+    ),
+)
 def get_search_results(client: Any, query_text: str, collection_name: str, top_k: int):
     """
     Retrieve search results with retry mechanism.
@@ -64,32 +93,70 @@ def get_search_results(client: Any, query_text: str, collection_name: str, top_k
     return results
 
 
+def group_queries(queries_df: Any, deduplicate: bool = True) -> List[List[int]]:
+    """
+    Group the rows of a query DataFrame that can share a single search.
+
+    Within one evaluation the collection and top_k are fixed, so rows with identical
+    query text issue identical searches.
+
+    Args:
+        queries_df (Any): DataFrame containing a 'query' column.
+        deduplicate (bool, optional): If False, every row gets its own group. Defaults to True.
+
+    Returns:
+        List[List[int]]: Positional row indices per unique search, in first-seen order.
+    """
+    if not deduplicate:
+        return [[i] for i in range(len(queries_df))]
+    groups = {}
+    for i, query_text in enumerate(queries_df["query"]):
+        groups.setdefault(query_text, []).append(i)
+    return list(groups.values())
+
+
 def evaluate_rag_model(
     queries_df: Any,
     client: Any,
     collection_name: str,
     top_k: int = 5,
-) -> Tuple[float, List[float]]:
+    deduplicate_queries: bool = True,
+    rankings_path: Optional[str] = None,
+) -> Tuple[float, List[float], float, int]:
     """
     Evaluate a retrieval-augmented generation (RAG) model using NDCG, with retry logic.
 
+    Rows with the same query text are searched once, and the shared result is scored
+    against each row's own true document.
+
     Args:
         queries_df (Any): DataFrame containing queries and true document IDs.
         client (Any): Search client to retrieve results.
         collection_name (str): Name of the collection to search.
         top_k (int, optional): Number of top results to consider. Defaults to 5.
+        deduplicate_queries (bool, optional): Share one search between identical queries. Defaults to True.
+        rankings_path (Optional[str], optional): Parquet file to store the full ranked results
+            (document names and scores) of every query in, for `compare_runs`. Not written if None.
 
     Returns:
-        Tuple[float, List[float]]: The mean NDCG score and a list of individual NDCG scores for each query.
+        Tuple[float, List[float], float, int]: The mean NDCG score, the NDCG score for each query
+            row (in row order), the average search latency, and the number of API calls saved.
     """
-    ndcg_scores = []
+    ndcg_scores = [0.0] * len(queries_df)
     latencies = []
-    for _, query_data in tqdm(
-        queries_df.iterrows(), total=len(queries_df), desc="Evaluating"
-    ):
-        query_text = query_data["query"]
-        true_doc_id = query_data["image_filename"]
-
+    labels = {"collection": collection_name}
+    query_texts = queries_df["query"].tolist()
+    true_doc_ids = queries_df["image_filename"].tolist()
+    groups = group_queries(queries_df, deduplicate_queries)
+    api_calls_saved = len(queries_df) - len(groups)
+    rankings = []
+
+    num_scored = 0
+    total_ndcg = 0.0
+    for rows in tqdm(groups, total=len(groups), desc="Evaluating"):
+        query_text = query_texts[rows[0]]
+
+        REGISTRY.add("evaluator_in_flight_requests", 1, labels)
         try:
             start = time.time()
             results = get_search_results(
@@ -97,13 +164,30 @@ def evaluate_rag_model(
             )
             end = time.time()
             latencies.append(end - start)
-            ndcg_score = ndcg_at_k(results.results, true_doc_id, k=top_k)
+            REGISTRY.observe("evaluator_search_latency_seconds", end - start, labels)
+            rankings.extend(ranking_records(query_text, results.results))
+            for i in rows:
+                ndcg_scores[i] = ndcg_at_k(results.results, true_doc_ids[i], k=top_k)
         except Exception as e:
             print(f"Failed to retrieve results for query '{query_text}': {e}")
-            ndcg_score = 0  # Assign a score of 0 if retrieval fails after retries
-
-        ndcg_scores.append(ndcg_score)
+            REGISTRY.inc("evaluator_errors_total", labels=labels)
+            for i in rows:
+                ndcg_scores[i] = 0  # Assign a score of 0 if retrieval fails after retries
+        finally:
+            REGISTRY.add("evaluator_in_flight_requests", -1, labels)
+
+        num_scored += len(rows)
+        total_ndcg += sum(ndcg_scores[i] for i in rows)
+        REGISTRY.inc("evaluator_queries_total", len(rows), labels=labels)
+        REGISTRY.inc("evaluator_api_calls_saved_total", len(rows) - 1, labels=labels)
+        # one search may serve several query rows: track both rates
+        REGISTRY.mark("evaluator_queries", labels, count=len(rows))
+        REGISTRY.mark("evaluator_searches", labels)
+        REGISTRY.set("evaluator_running_ndcg", total_ndcg / num_scored, labels)
+
+    if rankings_path:
+        save_rankings(rankings, rankings_path)
 
     avg_latency = sum(latencies) / len(latencies) if latencies else 0.0
     mean_ndcg_score = np.mean(ndcg_scores)
-    return mean_ndcg_score, ndcg_scores, avg_latency
+    return mean_ndcg_score, ndcg_scores, avg_latency, api_calls_saved
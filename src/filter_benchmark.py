@@ -0,0 +1,179 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+from src.evaluator import ndcg_at_k
+from src.scaling import latency_summary
+
+SELECTIVITY_LEVELS = [1, 5, 10, 25, 50, 100]
+
+
+def selectivity_key(level: float) -> str:
+    """Return the metadata key marking documents in the `level` percent subset."""
+    return f"sel_{level:g}"
+
+
+def selectivity_percentile(doc_id: str) -> float:
+    """
+    Map a document ID to a stable pseudo-random position in [0, 100).
+
+    A document belongs to the `p` percent subset if its position is below `p`, so
+    the subsets are nested and their sizes follow the requested selectivity.
+
+    Args:
+        doc_id (str): The document's 'doc_id' metadata value.
+
+    Returns:
+        float: The document's position.
+    """
+    digest = hashlib.sha256(str(doc_id).encode()).hexdigest()
+    return int(digest[:8], 16) % 10000 / 100
+
+
+def selectivity_tags(doc_id: str, levels: List[float] = SELECTIVITY_LEVELS) -> Dict[str, bool]:
+    """Return the selectivity metadata keys a document carries."""
+    position = selectivity_percentile(doc_id)
+    return {selectivity_key(level): True for level in levels if position < level}
+
+
+def selectivity_filter(level: float) -> Dict[str, Any]:
+    """Return the search filter selecting the `level` percent subset."""
+    return {
+        "on": "document",
+        "key": selectivity_key(level),
+        "value": True,
+        "lookup": "key_lookup",
+    }
+
+
+def tag_collection(
+    client: Any,
+    collection_name: str,
+    levels: List[float] = SELECTIVITY_LEVELS,
+    max_workers: int = 8,
+) -> List[Dict[str, Any]]:
+    """
+    Add the selectivity keys to the metadata of every document in a collection.
+
+    Documents keep their existing metadata and are not re-uploaded. Documents that
+    already carry the right keys are left alone, so re-running is cheap.
+
+    Args:
+        client (Any): The Colivara client.
+        collection_name (str): The collection to tag.
+        levels (List[float], optional): Selectivity levels in percent.
+        max_workers (int, optional): Maximum number of concurrent updates.
+
+    Returns:
+        List[Dict[str, Any]]: The updated metadata of every document.
+    """
+    documents = client.list_documents(collection_name)
+
+    def tag(document: Any) -> Dict[str, Any]:
+        metadata = dict(document.metadata or {})
+        untagged = {k: v for k, v in metadata.items() if not k.startswith("sel_")}
+        tagged = {**untagged, **selectivity_tags(metadata.get("doc_id", document.name), levels)}
+        if tagged != metadata:
+            client.partial_update_document(
+                document.name, metadata=tagged, collection_name=collection_name
+            )
+        return tagged
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(tqdm(pool.map(tag, documents), total=len(documents), desc="Tagging documents"))
+
+
+def run_filter_benchmark(
+    client: Any,
+    queries_df: pd.DataFrame,
+    collection_name: str,
+    documents_metadata: List[Dict[str, Any]],
+    levels: List[float] = SELECTIVITY_LEVELS,
+    top_k: int = 5,
+) -> pd.DataFrame:
+    """
+    Search the same queries unfiltered and at each selectivity level.
+
+    NDCG is reported over all queries, and over the queries whose target page is
+    inside the filtered subset. Only the latter can be found, so comparing them
+    with the unfiltered NDCG of the same queries shows whether filtering changes
+    the ranking itself.
+
+    Args:
+        client (Any): Search client to retrieve results.
+        queries_df (pd.DataFrame): DataFrame containing queries and true document IDs.
+        collection_name (str): Name of the tagged collection.
+        documents_metadata (List[Dict[str, Any]]): Metadata of every document, as returned by `tag_collection`.
+        levels (List[float], optional): Selectivity levels in percent.
+        top_k (int, optional): Number of top results to consider. Defaults to 5.
+
+    Returns:
+        pd.DataFrame: One row per level (None for unfiltered) with latency and NDCG.
+    """
+    queries = queries_df["query"].tolist()
+    true_doc_ids = queries_df["image_filename"].tolist()
+
+    baseline = None
+    rows = []
+    for level in tqdm([None] + list(levels), desc="Selectivity levels"):
+        query_filter = selectivity_filter(level) if level is not None else None
+        latencies, ndcg_scores = [], []
+        for query_text, true_doc_id in zip(queries, true_doc_ids):
+            try:
+                start = time.time()
+                results = client.search(
+                    query=query_text,
+                    collection_name=collection_name,
+                    top_k=top_k,
+                    query_filter=query_filter,
+                )
+                latencies.append(time.time() - start)
+                ndcg_scores.append(ndcg_at_k(results.results, true_doc_id, k=top_k))
+            except Exception as e:
+                print(f"Failed to search '{query_text}' at selectivity {level}: {e}")
+                ndcg_scores.append(0.0)
+        ndcg_scores = np.array(ndcg_scores)
+        if level is None:
+            baseline = ndcg_scores
+
+        key = selectivity_key(level) if level is not None else None
+        in_subset = [m for m in documents_metadata if key is None or m.get(key)]
+        filenames = subset_filenames(in_subset)
+        target_in_subset = np.array([str(t) in filenames for t in true_doc_ids], dtype=bool)
+        summary = latency_summary(latencies)
+        rows.append(
+            {
+                "selectivity": level,
+                "subset_fraction": len(in_subset) / len(documents_metadata)
+                if documents_metadata
+                else np.nan,
+                "num_searches": len(latencies),
+                "avg_latency": summary["mean"],
+                "p50_latency": summary["p50"],
+                "p95_latency": summary["p95"],
+                "ndcg": float(ndcg_scores.mean()) if len(ndcg_scores) else np.nan,
+                "queries_in_subset": int(target_in_subset.sum()),
+                "ndcg_in_subset": _masked_mean(ndcg_scores, target_in_subset),
+                "unfiltered_ndcg_in_subset": _masked_mean(baseline, target_in_subset),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def subset_filenames(documents_metadata: List[Dict[str, Any]]) -> Set[str]:
+    """Return every image filename that `is_relevant` would match in these documents."""
+    filenames = set()
+    for metadata in documents_metadata:
+        if "image_file_name" in metadata:
+            filenames.add(str(metadata["image_file_name"]))
+        filenames.update(str(name) for name in metadata.get("image_file_names", []))
+    return filenames
+
+
+def _masked_mean(values: Optional[np.ndarray], mask: np.ndarray) -> float:
+    if values is None or not mask.any():
+        return np.nan
+    return float(values[mask].mean())
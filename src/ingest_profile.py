@@ -0,0 +1,132 @@
+import os
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+PROFILE_COLUMNS = [
+    "doc_id",
+    "image_filename",
+    "width",
+    "height",
+    "pixels",
+    "encoded_bytes",
+    "encode_seconds",
+    "upload_seconds",
+    "index_wait_seconds",
+    "total_seconds",
+]
+
+
+def image_dimensions(image: Any) -> Dict[str, int]:
+    """
+    Return the pixel dimensions of a page image without encoding it.
+
+    Args:
+        image (Any): A PIL image.
+
+    Returns:
+        Dict[str, int]: The width, height and number of pixels.
+    """
+    width, height = image.size
+    return {"width": width, "height": height, "pixels": width * height}
+
+
+def save_profile(records: List[Dict[str, Any]], path: str) -> pd.DataFrame:
+    """
+    Write per-document ingest records to a Parquet file.
+
+    If the file already exists the new records are appended, so profiles from
+    several runs or datasets accumulate into one file.
+
+    Args:
+        records (List[Dict[str, Any]]): One record per upserted document.
+        path (str): The Parquet file to write.
+
+    Returns:
+        pd.DataFrame: Everything now stored in the file.
+    """
+    profile = pd.DataFrame(records, columns=PROFILE_COLUMNS)
+    if os.path.exists(path):
+        profile = pd.concat([pd.read_parquet(path), profile], ignore_index=True)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    profile.to_parquet(path, index=False)
+    return profile
+
+
+def load_profile(path: str) -> pd.DataFrame:
+    """
+    Load per-document ingest records written by `save_profile`.
+
+    Args:
+        path (str): The Parquet file.
+
+    Returns:
+        pd.DataFrame: The ingest records.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The profile at {path} was not found.")
+    return pd.read_parquet(path)
+
+
+def fit_ingest_model(profile: pd.DataFrame) -> Dict[str, float]:
+    """
+    Fit per-document ingest time as a linear function of image megapixels.
+
+    Args:
+        profile (pd.DataFrame): Ingest records with 'pixels' and 'total_seconds' columns.
+
+    Returns:
+        Dict[str, float]: The intercept and per-megapixel slope in seconds, and the
+            residual standard deviation of a single document's time.
+
+    Raises:
+        ValueError: If the profile has no records.
+    """
+    profile = profile.dropna(subset=["pixels", "total_seconds"])
+    if profile.empty:
+        raise ValueError("The ingest profile has no records to fit.")
+
+    megapixels = profile["pixels"].to_numpy(dtype=float) / 1e6
+    seconds = profile["total_seconds"].to_numpy(dtype=float)
+    if len(np.unique(megapixels)) < 2:
+        # every page has the same size: predict the mean cost per document
+        return {"intercept": float(seconds.mean()), "slope": 0.0, "residual_std": float(seconds.std())}
+
+    design = np.column_stack([np.ones_like(megapixels), megapixels])
+    (intercept, slope), *_ = np.linalg.lstsq(design, seconds, rcond=None)
+    residuals = seconds - design @ np.array([intercept, slope])
+    return {"intercept": float(intercept), "slope": float(slope), "residual_std": float(residuals.std())}
+
+
+def estimate_ingest_time(df: pd.DataFrame, profile: pd.DataFrame) -> Dict[str, float]:
+    """
+    Predict how long upserting a dataset will take, before uploading anything.
+
+    Each page's time is predicted from its pixel count with `fit_ingest_model`. The
+    interval assumes independent per-document errors.
+
+    Args:
+        df (pd.DataFrame): The dataset to ingest, with an 'image' column.
+        profile (pd.DataFrame): Measured ingest records from earlier runs.
+
+    Returns:
+        Dict[str, float]: The number of documents, predicted total seconds and a
+            95% interval for it, and the mean megapixels of the dataset.
+    """
+    model = fit_ingest_model(profile)
+    megapixels = np.array([image_dimensions(image)["pixels"] for image in df["image"]]) / 1e6
+    predicted = np.maximum(model["intercept"] + model["slope"] * megapixels, 0.0)
+    total = float(predicted.sum())
+    margin = 1.96 * model["residual_std"] * np.sqrt(len(df))
+    return {
+        "num_documents": len(df),
+        "mean_megapixels": float(megapixels.mean()) if len(df) else 0.0,
+        "predicted_seconds": total,
+        "lower_seconds": max(total - margin, 0.0),
+        "upper_seconds": total + margin,
+    }
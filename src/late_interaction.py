@@ -0,0 +1,319 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from tenacity import retry, stop_after_attempt, wait_fixed
+from tqdm import tqdm
+
+from src.document_manager import encode_image_base64
+from src.evaluator import ndcg_at_k
+
+VECTORS_FILE = "vectors.npy"
+OFFSETS_FILE = "offsets.npy"
+META_FILE = "meta.json"
+
+
+@dataclass
+class LocalResult:
+    """A locally scored page, shaped like the API's search results so `ndcg_at_k` accepts it."""
+
+    document_name: str
+    raw_score: float
+    document_metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class EmbeddingCache:
+    """
+    Multi-vector embeddings stored as one flat float16 array.
+
+    The vectors of item i are ``vectors[offsets[i]:offsets[i + 1]]``.
+    """
+
+    vectors: np.ndarray
+    offsets: np.ndarray
+    ids: List[str]
+    metadata: List[Dict[str, Any]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@retry(stop=stop_after_attempt(5), wait=wait_fixed(2))
+def create_embeddings(client: Any, input_data: List[str], task: str) -> List[np.ndarray]:
+    """
+    Create multi-vector embeddings through the API, with retry logic.
+
+    Args:
+        client (Any): The Colivara client.
+        input_data (List[str]): Query texts or base64-encoded images.
+        task (str): Either "query" or "image".
+
+    Returns:
+        List[np.ndarray]: One (num_tokens, dim) float16 array per input.
+    """
+    response = client.create_embedding(input_data, task=task)
+    data = sorted(response.data, key=lambda item: item.get("index", 0))
+    return [np.asarray(item["embedding"], dtype=np.float16) for item in data]
+
+
+def save_embedding_cache(
+    cache_dir: str,
+    embeddings: List[np.ndarray],
+    ids: List[str],
+    metadata: List[Dict[str, Any]],
+) -> EmbeddingCache:
+    """
+    Write embeddings to disk as a memory-mappable float16 array.
+
+    Args:
+        cache_dir (str): Directory to write the cache into.
+        embeddings (List[np.ndarray]): One (num_tokens, dim) array per item.
+        ids (List[str]): The identifier of each item.
+        metadata (List[Dict[str, Any]]): Metadata of each item, e.g. the image filename.
+
+    Returns:
+        EmbeddingCache: The cache, memory-mapped from disk.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    lengths = [len(emb) for emb in embeddings]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    dim = embeddings[0].shape[1] if embeddings else 0
+
+    vectors = np.lib.format.open_memmap(
+        os.path.join(cache_dir, VECTORS_FILE),
+        mode="w+",
+        dtype=np.float16,
+        shape=(int(offsets[-1]), dim),
+    )
+    for i, emb in enumerate(embeddings):
+        vectors[offsets[i] : offsets[i + 1]] = emb
+    vectors.flush()
+    del vectors
+
+    np.save(os.path.join(cache_dir, OFFSETS_FILE), offsets)
+    with open(os.path.join(cache_dir, META_FILE), "w") as f:
+        json.dump({"ids": [str(i) for i in ids], "metadata": metadata}, f)
+    return load_embedding_cache(cache_dir)
+
+
+def load_embedding_cache(cache_dir: str) -> EmbeddingCache:
+    """
+    Load an embedding cache written by `save_embedding_cache`.
+
+    Args:
+        cache_dir (str): The cache directory.
+
+    Returns:
+        EmbeddingCache: The cache, with vectors memory-mapped read-only.
+
+    Raises:
+        FileNotFoundError: If the cache directory is incomplete.
+    """
+    for name in (VECTORS_FILE, OFFSETS_FILE, META_FILE):
+        if not os.path.exists(os.path.join(cache_dir, name)):
+            raise FileNotFoundError(f"Embedding cache at {cache_dir} is missing {name}.")
+    with open(os.path.join(cache_dir, META_FILE)) as f:
+        meta = json.load(f)
+    return EmbeddingCache(
+        vectors=np.load(os.path.join(cache_dir, VECTORS_FILE), mmap_mode="r"),
+        offsets=np.load(os.path.join(cache_dir, OFFSETS_FILE)),
+        ids=meta["ids"],
+        metadata=meta["metadata"],
+    )
+
+
+def build_query_cache(
+    client: Any, queries_df: pd.DataFrame, cache_dir: str, batch_size: int = 32
+) -> EmbeddingCache:
+    """
+    Fetch query embeddings from the API once and cache them on disk.
+
+    Args:
+        client (Any): The Colivara client.
+        queries_df (pd.DataFrame): DataFrame with 'query' and 'image_filename' columns.
+        cache_dir (str): Directory to write the cache into.
+        batch_size (int, optional): Number of queries per API call. Defaults to 32.
+
+    Returns:
+        EmbeddingCache: The query cache.
+    """
+    queries = queries_df["query"].tolist()
+    embeddings = []
+    for start in tqdm(range(0, len(queries), batch_size), desc="Embedding queries"):
+        embeddings.extend(
+            create_embeddings(client, queries[start : start + batch_size], task="query")
+        )
+    metadata = [
+        {"query": query, "image_filename": str(filename)}
+        for query, filename in zip(queries, queries_df["image_filename"])
+    ]
+    return save_embedding_cache(
+        cache_dir, embeddings, [str(i) for i in queries_df.index], metadata
+    )
+
+
+def build_page_cache(
+    client: Any, df: pd.DataFrame, cache_dir: str, batch_size: int = 4
+) -> EmbeddingCache:
+    """
+    Fetch page image embeddings from the API once and cache them on disk.
+
+    The cached metadata mirrors what `upsert_documents` attaches to each document,
+    so locally scored results can be fed straight into `ndcg_at_k`.
+
+    Args:
+        client (Any): The Colivara client.
+        df (pd.DataFrame): DataFrame with 'id', 'image' and 'image_filename' columns.
+        cache_dir (str): Directory to write the cache into.
+        batch_size (int, optional): Number of images per API call. Defaults to 4.
+
+    Returns:
+        EmbeddingCache: The page cache.
+    """
+    embeddings = []
+    for start in tqdm(range(0, len(df), batch_size), desc="Embedding pages"):
+        images = [
+            encode_image_base64(image)
+            for image in df["image"].iloc[start : start + batch_size]
+        ]
+        embeddings.extend(create_embeddings(client, images, task="image"))
+
+    metadata = []
+    for i in range(len(df)):
+        meta = {
+            "doc_id": str(df["id"].iloc[i]),
+            "image_file_name": df["image_filename"].iloc[i],
+        }
+        if "image_filenames" in df.columns:
+            meta["image_file_names"] = list(df["image_filenames"].iloc[i])
+        metadata.append(meta)
+    return save_embedding_cache(
+        cache_dir, embeddings, [str(i) for i in df["id"]], metadata
+    )
+
+
+def maxsim_scores(
+    queries: EmbeddingCache,
+    pages: EmbeddingCache,
+    page_chunk_tokens: int = 16384,
+    query_chunk_tokens: int = 1024,
+) -> np.ndarray:
+    """
+    Score every query against every page with late-interaction MaxSim.
+
+    For each query token the best-matching page token is taken, and these maxima
+    are summed over the query tokens. Pages and queries are processed in chunks of
+    whole items. The temporary similarity matrix of one chunk pair takes about
+    4 * query_chunk_tokens * page_chunk_tokens bytes, 64 MiB with the defaults;
+    a single item longer than its chunk size gets a chunk of its own.
+
+    Args:
+        queries (EmbeddingCache): The query embeddings.
+        pages (EmbeddingCache): The page embeddings.
+        page_chunk_tokens (int, optional): Approximate number of page tokens per chunk.
+        query_chunk_tokens (int, optional): Approximate number of query tokens per chunk.
+
+    Returns:
+        np.ndarray: A (num_queries, num_pages) float32 score matrix.
+    """
+    scores = np.empty((len(queries), len(pages)), dtype=np.float32)
+    for p_start, p_end in _chunk_bounds(pages.offsets, page_chunk_tokens):
+        page_vectors = np.asarray(
+            pages.vectors[pages.offsets[p_start] : pages.offsets[p_end]],
+            dtype=np.float32,
+        )
+        page_starts = pages.offsets[p_start:p_end] - pages.offsets[p_start]
+
+        for q_start, q_end in _chunk_bounds(queries.offsets, query_chunk_tokens):
+            query_vectors = np.asarray(
+                queries.vectors[queries.offsets[q_start] : queries.offsets[q_end]],
+                dtype=np.float32,
+            )
+            query_starts = queries.offsets[q_start:q_end] - queries.offsets[q_start]
+
+            # (query tokens, page tokens) -> best page token per page -> sum per query
+            similarities = query_vectors @ page_vectors.T
+            token_max = np.maximum.reduceat(similarities, page_starts, axis=1)
+            scores[q_start:q_end, p_start:p_end] = np.add.reduceat(
+                token_max, query_starts, axis=0
+            )
+    return scores
+
+
+def _chunk_bounds(offsets: np.ndarray, max_tokens: int) -> List[Tuple[int, int]]:
+    """Split items into contiguous [start, end) runs of roughly max_tokens tokens each."""
+    bounds = []
+    start = 0
+    num_items = len(offsets) - 1
+    while start < num_items:
+        end = int(np.searchsorted(offsets, offsets[start] + max_tokens, side="right")) - 1
+        end = min(max(end, start + 1), num_items)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def top_k_results(
+    scores: np.ndarray, pages: EmbeddingCache, top_k: int
+) -> List[List[LocalResult]]:
+    """
+    Turn a score matrix into ranked result lists.
+
+    Args:
+        scores (np.ndarray): A (num_queries, num_pages) score matrix.
+        pages (EmbeddingCache): The page cache the scores refer to.
+        top_k (int): Number of results to keep per query.
+
+    Returns:
+        List[List[LocalResult]]: The top_k results per query, best first.
+    """
+    top_k = min(top_k, scores.shape[1])
+    candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    ranked = np.take_along_axis(
+        candidates, np.argsort(-candidate_scores, axis=1, kind="stable"), axis=1
+    )
+    return [
+        [
+            LocalResult(
+                document_name=pages.ids[j],
+                raw_score=float(scores[q, j]),
+                document_metadata=pages.metadata[j],
+            )
+            for j in row
+        ]
+        for q, row in enumerate(ranked)
+    ]
+
+
+def evaluate_local(
+    queries: EmbeddingCache,
+    pages: EmbeddingCache,
+    top_k: int = 5,
+    scores: np.ndarray = None,
+) -> Tuple[float, List[float]]:
+    """
+    Evaluate cached embeddings offline with the same NDCG metric as `evaluate_rag_model`.
+
+    Args:
+        queries (EmbeddingCache): The query cache, with 'image_filename' in each metadata entry.
+        pages (EmbeddingCache): The page cache.
+        top_k (int, optional): Number of top results to consider. Defaults to 5.
+        scores (np.ndarray, optional): A precomputed score matrix, so sweeps over top_k
+            only need to score once.
+
+    Returns:
+        Tuple[float, List[float]]: The mean NDCG score and the NDCG score of each query.
+    """
+    if scores is None:
+        scores = maxsim_scores(queries, pages)
+    results = top_k_results(scores, pages, top_k)
+    ndcg_scores = [
+        ndcg_at_k(query_results, meta["image_filename"], k=top_k)
+        for query_results, meta in zip(results, queries.metadata)
+    ]
+    return float(np.mean(ndcg_scores)), ndcg_scores
@@ -0,0 +1,293 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# latency buckets in seconds, shared by all histograms
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(key) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class MetricsRegistry:
+    """
+    A thread-safe registry of counters, gauges, histograms and event rates.
+
+    Metrics are created on first use. Each one may carry labels, e.g.
+    ``registry.inc("evaluator_queries_total", labels={"collection": name})``.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, rate_window: float = 60.0):
+        self.buckets = buckets
+        self.rate_window = rate_window
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Dict[str, Any]]] = {}
+        self._events: Dict[str, Dict[LabelKey, deque]] = {}
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        """Increase a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Set a gauge."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def add(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Move a gauge up or down, e.g. for in-flight requests."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Record a value in a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.setdefault(
+                key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist["buckets"][i] += 1
+            hist["sum"] += value
+            hist["count"] += 1
+
+    def mark(
+        self, name: str, labels: Optional[Dict[str, str]] = None, count: int = 1
+    ) -> None:
+        """Record `count` events, exposed as a per-second rate over the rate window."""
+        key = _label_key(labels)
+        now = time.time()
+        with self._lock:
+            events = self._events.setdefault(name, {}).setdefault(key, deque())
+            events.extend([now] * count)
+            self._trim(events, now)
+
+    def _trim(self, events: deque, now: float) -> None:
+        while events and events[0] < now - self.rate_window:
+            events.popleft()
+
+    def _rates(self) -> Dict[str, Dict[LabelKey, float]]:
+        now = time.time()
+        window = min(self.rate_window, max(now - self.started_at, 1e-9))
+        rates = {}
+        for name, series in self._events.items():
+            rates[name] = {}
+            for key, events in series.items():
+                self._trim(events, now)
+                rates[name][key] = len(events) / window
+        return rates
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the current value of every metric as plain, JSON-serialisable data.
+
+        Returns:
+            Dict[str, Any]: Counters, gauges, rates and histograms, keyed by metric name.
+        """
+        def series_list(series: Dict[LabelKey, Any]) -> list:
+            return [{"labels": dict(key), "value": value} for key, value in series.items()]
+
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "uptime_seconds": time.time() - self.started_at,
+                "counters": {n: series_list(s) for n, s in self._counters.items()},
+                "gauges": {n: series_list(s) for n, s in self._gauges.items()},
+                "rates": {n: series_list(s) for n, s in self._rates().items()},
+                "histograms": {
+                    n: [
+                        {
+                            "labels": dict(key),
+                            "buckets": dict(zip(map(str, self.buckets), hist["buckets"])),
+                            "sum": hist["sum"],
+                            "count": hist["count"],
+                        }
+                        for key, hist in s.items()
+                    ]
+                    for n, s in self._histograms.items()
+                },
+            }
+
+    def render_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Rates are exposed as gauges named ``<event>_per_second``.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        with self._lock:
+            for name, series in self._counters.items():
+                lines.append(f"# TYPE {name} counter")
+                lines += [f"{name}{_format_labels(k)} {v}" for k, v in series.items()]
+            for name, series in self._gauges.items():
+                lines.append(f"# TYPE {name} gauge")
+                lines += [f"{name}{_format_labels(k)} {v}" for k, v in series.items()]
+            for name, series in self._rates().items():
+                lines.append(f"# TYPE {name}_per_second gauge")
+                lines += [
+                    f"{name}_per_second{_format_labels(k)} {v}" for k, v in series.items()
+                ]
+            for name, series in self._histograms.items():
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in series.items():
+                    for bound, count in zip(self.buckets, hist["buckets"]):
+                        labels = _format_labels(key, {"le": str(bound)})
+                        lines.append(f"{name}_bucket{labels} {count}")
+                    labels = _format_labels(key, {"le": "+Inf"})
+                    lines.append(f"{name}_bucket{labels} {hist['count']}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {hist['sum']}")
+                    lines.append(f"{name}_count{_format_labels(key)} {hist['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# the registry the evaluator and the ingester publish to
+REGISTRY = MetricsRegistry()
+
+
+def retry_labels(retry_state: Any, position: int) -> Dict[str, str]:
+    """
+    Return the collection labels of a call being retried by tenacity.
+
+    Args:
+        retry_state (Any): The tenacity retry state of the call.
+        position (int): Position of the 'collection_name' argument, if passed positionally.
+
+    Returns:
+        Dict[str, str]: The collection label, matching the other metrics of that collection.
+    """
+    collection_name = retry_state.kwargs.get("collection_name")
+    if collection_name is None and len(retry_state.args) > position:
+        collection_name = retry_state.args[position]
+    return {"collection": collection_name}
+
+
+def start_metrics_server(
+    port: int, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """
+    Serve the registry in Prometheus format on http://<host>:<port>/metrics.
+
+    Args:
+        port (int): The port to listen on.
+        registry (MetricsRegistry, optional): The registry to expose.
+        host (str, optional): The interface to bind. Defaults to localhost only.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call ``shutdown()`` to stop it.
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+    return server
+
+
+class StatsFileWriter:
+    """
+    Periodically writes a registry snapshot to a JSON file in a background thread.
+
+    Each write replaces the file atomically, so readers never see a partial file.
+    """
+
+    def __init__(self, path: str, interval: float = 10.0, registry: MetricsRegistry = REGISTRY):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "StatsFileWriter":
+        self._thread.start()
+        return self
+
+    def flush(self) -> None:
+        """Write the current snapshot to the stats file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.tmp", "w") as f:
+            json.dump(self.registry.snapshot(), f, indent=2)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def stop(self) -> None:
+        """Stop the background thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.flush()
+
+
+def start_live_metrics(
+    metrics_port: Optional[int] = None,
+    stats_file: Optional[str] = None,
+    stats_interval: float = 10.0,
+    registry: MetricsRegistry = REGISTRY,
+) -> Callable[[], None]:
+    """
+    Start the optional metrics endpoint and stats file writer for a run.
+
+    Args:
+        metrics_port (Optional[int]): Port for the Prometheus endpoint; not started if None.
+        stats_file (Optional[str]): Path of the JSON stats file; not written if None.
+        stats_interval (float, optional): Seconds between stats file flushes.
+        registry (MetricsRegistry, optional): The registry to publish.
+
+    Returns:
+        Callable[[], None]: Stops both and writes a final stats snapshot.
+    """
+    server = start_metrics_server(metrics_port, registry) if metrics_port is not None else None
+    writer = StatsFileWriter(stats_file, stats_interval, registry).start() if stats_file else None
+
+    def stop() -> None:
+        if writer is not None:
+            writer.stop()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    return stop
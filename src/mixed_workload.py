@@ -0,0 +1,219 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+import pandas as pd
+from src.document_manager import upsert_documents
+from src.evaluator import ndcg_at_k
+from src.scaling import latency_summary
+
+PHASES = ("baseline", "under_ingest")
+
+
+def timed_query(
+    client: Any, query_text: str, true_doc_id: Any, collection_name: str, top_k: int
+) -> Dict[str, Any]:
+    """
+    Search once, without retries, and score the result.
+
+    Retries would hide the interference this benchmark measures, so a failed
+    search is recorded as an error with an NDCG of 0.
+
+    Returns:
+        Dict[str, Any]: The latency in seconds, the NDCG, and whether the search failed.
+    """
+    start = time.time()
+    try:
+        results = client.search(query=query_text, collection_name=collection_name, top_k=top_k)
+        return {
+            "latency": time.time() - start,
+            "ndcg": ndcg_at_k(results.results, true_doc_id, k=top_k),
+            "error": False,
+        }
+    except Exception as e:
+        print(f"Failed to search '{query_text}' in {collection_name}: {e}")
+        return {"latency": time.time() - start, "ndcg": 0.0, "error": True}
+
+
+def run_search_load(
+    client: Any,
+    queries_df: pd.DataFrame,
+    collection_name: str,
+    top_k: int,
+    qps: float,
+    keep_going: Optional[Callable[[], bool]] = None,
+    max_workers: int = 32,
+) -> pd.DataFrame:
+    """
+    Issue searches at a fixed rate, whatever the latency of earlier searches.
+
+    Each search is started on a fixed schedule (open loop) in a worker thread,
+    so slow responses do not lower the offered load. The lag between a search's
+    scheduled and actual start is recorded; a growing lag means `max_workers`
+    is too small for the rate.
+
+    Args:
+        client (Any): Search client to retrieve results.
+        queries_df (pd.DataFrame): Queries with their true 'image_filename'.
+        collection_name (str): Name of the collection to search.
+        top_k (int): Number of top results to consider.
+        qps (float): Searches started per second.
+        keep_going (Optional[Callable[[], bool]], optional): If given, cycle through the
+            queries for as long as it returns True; otherwise search each query once.
+        max_workers (int, optional): Maximum number of searches in flight. Defaults to 32.
+
+    Returns:
+        pd.DataFrame: One row per search with its query, scheduled offset, lag, latency,
+            NDCG and error flag.
+    """
+    query_texts = queries_df["query"].tolist()
+    true_doc_ids = queries_df["image_filename"].tolist()
+    start = time.time()
+
+    def run(n: int, scheduled: float) -> Dict[str, Any]:
+        row = n % len(query_texts)
+        record = timed_query(client, query_texts[row], true_doc_ids[row], collection_name, top_k)
+        return {
+            "query": query_texts[row],
+            "offset": scheduled - start,
+            "lag": time.time() - scheduled - record["latency"],
+            **record,
+        }
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        n = 0
+        while query_texts and (n < len(query_texts) if keep_going is None else keep_going()):
+            scheduled = start + n / qps
+            time.sleep(max(0.0, scheduled - time.time()))
+            futures.append(pool.submit(run, n, scheduled))
+            n += 1
+    return pd.DataFrame([future.result() for future in futures])
+
+
+def run_mixed_workload(
+    client: Any,
+    queries_df: pd.DataFrame,
+    search_collection: str,
+    ingest_df: pd.DataFrame,
+    ingest_collection: str,
+    qps: float,
+    docs_per_second: Optional[float],
+    top_k: int = 5,
+    ingest_client: Optional[Any] = None,
+) -> pd.DataFrame:
+    """
+    Measure search latency and NDCG alone, then while another collection is ingested.
+
+    The baseline phase searches every query once at `qps`. The under-ingest phase
+    upserts `ingest_df` into `ingest_collection` at `docs_per_second` in a background
+    thread and cycles through the queries at the same `qps` until the ingest ends.
+
+    Args:
+        client (Any): Search client to retrieve results.
+        queries_df (pd.DataFrame): Queries with their true 'image_filename'.
+        search_collection (str): The collection searched in both phases.
+        ingest_df (pd.DataFrame): The documents ingested during the second phase.
+        ingest_collection (str): The collection ingested into; should differ from
+            `search_collection` so that NDCG is comparable between phases.
+        qps (float): Searches started per second in both phases.
+        docs_per_second (Optional[float]): Ingest rate; as fast as possible if None.
+        top_k (int, optional): Number of top results to consider. Defaults to 5.
+        ingest_client (Optional[Any], optional): Client for the ingest, so it does not share
+            a connection pool with the searches. Defaults to `client`.
+
+    Returns:
+        pd.DataFrame: One row per search, as from `run_search_load`, with its 'phase'.
+            Its `attrs` hold the number of documents actually upserted, the ingest's
+            duration and any error.
+    """
+    baseline = run_search_load(client, queries_df, search_collection, top_k, qps)
+
+    ingest: Dict[str, Any] = {"documents": 0, "seconds": np.nan, "error": None}
+    done = threading.Event()
+
+    def count_document(record: Dict[str, Any]) -> None:
+        ingest["documents"] += 1
+
+    def run_ingest() -> None:
+        start = time.time()
+        try:
+            upsert_documents(
+                ingest_client or client,
+                ingest_df,
+                ingest_collection,
+                docs_per_second=docs_per_second,
+                on_upserted=count_document,
+            )
+        except Exception as e:
+            print(f"Ingest into {ingest_collection} failed: {e}")
+            ingest["error"] = str(e)
+        finally:
+            ingest["seconds"] = time.time() - start
+            done.set()
+
+    thread = threading.Thread(target=run_ingest, daemon=True)
+    thread.start()
+    under_ingest = run_search_load(
+        client, queries_df, search_collection, top_k, qps, keep_going=lambda: not done.is_set()
+    )
+    thread.join()
+
+    searches = pd.concat(
+        [baseline.assign(phase=PHASES[0]), under_ingest.assign(phase=PHASES[1])],
+        ignore_index=True,
+    )
+    searches.attrs["ingest"] = ingest
+    return searches
+
+
+def summarize_mixed_workload(searches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare the phases of a mixed-workload run.
+
+    NDCG is compared over the queries searched in both phases, and averaged per
+    query first, so queries searched several times while cycling do not outweigh
+    the others.
+
+    Args:
+        searches (pd.DataFrame): The searches from `run_mixed_workload`.
+
+    Returns:
+        pd.DataFrame: One row per phase with the number of searches, achieved QPS,
+            error rate, mean lag, latency percentiles and NDCG, plus a row with the
+            ratio of the under-ingest latencies to the baseline ones.
+    """
+    common = set.intersection(
+        *(set(searches.loc[searches["phase"] == phase, "query"]) for phase in PHASES)
+    )
+    rows = []
+    for phase in PHASES:
+        phase_searches = searches[searches["phase"] == phase]
+        ok = phase_searches[~phase_searches["error"]]
+        summary = latency_summary(ok["latency"].tolist())
+        duration = phase_searches["offset"].max() if len(phase_searches) > 1 else np.nan
+        rows.append(
+            {
+                "phase": phase,
+                "num_searches": len(phase_searches),
+                "achieved_qps": (len(phase_searches) - 1) / duration if duration else np.nan,
+                "error_rate": phase_searches["error"].mean() if len(phase_searches) else np.nan,
+                "mean_lag": phase_searches["lag"].mean() if len(phase_searches) else np.nan,
+                "avg_latency": summary["mean"],
+                "p50_latency": summary["p50"],
+                "p95_latency": summary["p95"],
+                "p99_latency": summary["p99"],
+                "ndcg": phase_searches[phase_searches["query"].isin(common)]
+                .groupby("query")["ndcg"]
+                .mean()
+                .mean(),
+            }
+        )
+    result = pd.DataFrame(rows)
+
+    baseline, loaded = result.iloc[0], result.iloc[1]
+    ratio = {"phase": "ratio"}
+    for column in ["avg_latency", "p50_latency", "p95_latency", "p99_latency"]:
+        ratio[column] = loaded[column] / baseline[column] if baseline[column] else np.nan
+    return pd.concat([result, pd.DataFrame([ratio])], ignore_index=True)
@@ -0,0 +1,310 @@
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import pandas as pd
+from src.data_loader import MANIFEST_FILE, list_parts, load_data, resolve_parts_dir
+from src.document_manager import upsert_documents
+from src.evaluator import evaluate_rag_model
+
+GRID_KEYS = ("top_k", "n_rows")
+DEFAULT_GRID = {"top_k": [5], "n_rows": [None]}
+
+
+def load_plan(path: str) -> Dict[str, Any]:
+    """
+    Load and validate a benchmark plan.
+
+    A plan lists the datasets, the endpoints and a parameter grid::
+
+        {
+            "name": "release-check",
+            "datasets": [{"name": "arxivqa_test_subsampled"}],
+            "endpoints": [{"name": "prod", "base_url": "https://api.colivara.com"}],
+            "grid": {"top_k": [1, 5, 10], "n_rows": [null]},
+            "upsert": false,
+            "max_workers": 4
+        }
+
+    Each dataset's collection defaults to its name, and its query and document
+    files default to data/queries/<name>_queries.pkl and data/full/<name>.pkl.
+    Each endpoint's API key is read from the environment variable named by
+    'api_key_env', which defaults to COLIVARA_API_KEY.
+
+    Args:
+        path (str): The JSON plan file.
+
+    Returns:
+        Dict[str, Any]: The plan with defaults filled in.
+
+    Raises:
+        FileNotFoundError: If the plan file does not exist.
+        ValueError: If the plan is missing datasets or endpoints, or has unknown grid keys.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The plan at {path} was not found.")
+    with open(path) as f:
+        plan = json.load(f)
+
+    if not plan.get("datasets") or not plan.get("endpoints"):
+        raise ValueError("A plan needs at least one dataset and one endpoint.")
+    unknown = set(plan.get("grid", {})) - set(GRID_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown grid keys {sorted(unknown)}, expected {GRID_KEYS}.")
+
+    plan.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    plan.setdefault("output_dir", os.path.join("out", "plans", plan["name"]))
+    plan.setdefault("upsert", False)
+    plan.setdefault("max_workers", 4)
+    plan["grid"] = {**DEFAULT_GRID, **plan.get("grid", {})}
+    for dataset in plan["datasets"]:
+        dataset.setdefault("collection", dataset["name"])
+        dataset.setdefault("query_file", f"data/queries/{dataset['name']}_queries.pkl")
+        dataset.setdefault("document_file", f"data/full/{dataset['name']}.pkl")
+    for endpoint in plan["endpoints"]:
+        endpoint.setdefault("name", endpoint["base_url"])
+        endpoint.setdefault("api_key_env", "COLIVARA_API_KEY")
+    return plan
+
+
+def file_fingerprint(path: str) -> str:
+    """Return the SHA-256 of a file's content, or of its path if it does not exist."""
+    hasher = hashlib.sha256()
+    if not os.path.isfile(path):
+        hasher.update(path.encode())
+        return hasher.hexdigest()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def dataset_fingerprint(path: str) -> str:
+    """
+    Return the SHA-256 of a document dataset's content.
+
+    For a part directory written by `download_datasets`, the part hashes recorded
+    in its manifest are combined instead of re-reading every part.
+
+    Args:
+        path (str): A pickle file, or a part directory (or "<name>.pkl" next to one).
+
+    Returns:
+        str: The content hash.
+    """
+    parts_dir = resolve_parts_dir(path)
+    if parts_dir is None:
+        return file_fingerprint(path)
+    manifest_path = os.path.join(parts_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            part_hashes = [part["sha256"] for part in json.load(f)["parts"]]
+    else:
+        part_hashes = [file_fingerprint(part) for part in list_parts(parts_dir)]
+    return hashlib.sha256("".join(part_hashes).encode()).hexdigest()
+
+
+def ingest_params(dataset: Dict[str, Any], endpoint: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the parameters that identify one dataset's ingest into one endpoint."""
+    return {
+        "document_file": dataset["document_file"],
+        "document_file_sha256": dataset_fingerprint(dataset["document_file"]),
+        "collection": dataset["collection"],
+        "base_url": endpoint["base_url"],
+    }
+
+
+def fingerprint(params: Dict[str, Any]) -> str:
+    """Return a short, stable hash of a cell's parameters."""
+    canonical = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def expand_cells(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand a plan into its evaluation cells: datasets x endpoints x grid.
+
+    A cell's fingerprint covers everything that affects its result, including the
+    content of the query file and, when the plan upserts, the fingerprint of the
+    ingest that built its collection, but not secrets such as API keys.
+
+    Args:
+        plan (Dict[str, Any]): A plan from `load_plan`.
+
+    Returns:
+        List[Dict[str, Any]]: One cell per combination, with 'params' and 'fingerprint'.
+    """
+    query_hashes = {d["query_file"]: file_fingerprint(d["query_file"]) for d in plan["datasets"]}
+    ingests = {}
+    if plan["upsert"]:
+        for dataset, endpoint in itertools.product(plan["datasets"], plan["endpoints"]):
+            params = ingest_params(dataset, endpoint)
+            ingests[dataset["name"], endpoint["name"]] = fingerprint(params)
+    grid = [plan["grid"][key] for key in GRID_KEYS]
+
+    cells = []
+    for dataset, endpoint, values in itertools.product(
+        plan["datasets"], plan["endpoints"], itertools.product(*grid)
+    ):
+        params = {
+            "dataset": dataset["name"],
+            "collection": dataset["collection"],
+            "query_file": dataset["query_file"],
+            "query_file_sha256": query_hashes[dataset["query_file"]],
+            "endpoint": endpoint["name"],
+            "base_url": endpoint["base_url"],
+            **dict(zip(GRID_KEYS, values)),
+        }
+        if plan["upsert"]:
+            params["ingest"] = ingests[dataset["name"], endpoint["name"]]
+        cells.append({"params": params, "fingerprint": fingerprint(params)})
+    return cells
+
+
+def cell_path(plan: Dict[str, Any], cell: Dict[str, Any]) -> str:
+    return os.path.join(plan["output_dir"], f"{cell['fingerprint']}.json")
+
+
+def pending_cells(plan: Dict[str, Any], cells: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the cells whose results do not exist yet."""
+    return [cell for cell in cells if not os.path.exists(cell_path(plan, cell))]
+
+
+def run_cell(cell: Dict[str, Any], client: Any, max_workers: int = 1) -> Dict[str, Any]:
+    """
+    Evaluate one cell.
+
+    Args:
+        cell (Dict[str, Any]): A cell from `expand_cells`.
+        client (Any): The client of the cell's endpoint.
+        max_workers (int, optional): Number of cells run at once, recorded with the results:
+            with more than one, `avg_latency` was measured under contention from the other
+            cells and is not comparable with a serial `evaluate.py` run. Defaults to 1.
+
+    Returns:
+        Dict[str, Any]: The cell's parameters and results.
+    """
+    params = cell["params"]
+    queries_df: pd.DataFrame = pd.read_pickle(params["query_file"])
+    queries_df.dropna(subset=["query"], inplace=True)
+    if params["n_rows"] is not None:
+        queries_df = queries_df.head(params["n_rows"]).copy()
+
+    avg_ndcg_score, ndcg_scores, avg_latency, api_calls_saved = evaluate_rag_model(
+        queries_df, client, params["collection"], top_k=params["top_k"]
+    )
+    return {
+        "fingerprint": cell["fingerprint"],
+        "params": params,
+        "results": {
+            "avg_ndcg_score": float(avg_ndcg_score),
+            "avg_latency": avg_latency,
+            "num_queries": len(queries_df),
+            "api_calls_saved": api_calls_saved,
+            "max_workers": max_workers,
+            "ndcg_scores": [float(score) for score in ndcg_scores],
+        },
+    }
+
+
+def save_cell(plan: Dict[str, Any], cell: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Atomically write a cell's result, so an interrupted run never leaves a partial cell."""
+    os.makedirs(plan["output_dir"], exist_ok=True)
+    path = cell_path(plan, cell)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(result, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def ingest_datasets(plan: Dict[str, Any], clients: Dict[str, Any]) -> None:
+    """
+    Upsert each dataset into its collection on each endpoint, once.
+
+    Completed ingests are recorded as marker files keyed by a fingerprint of the
+    document content and target, so re-running the plan does not upload again
+    unless the documents changed.
+
+    Args:
+        plan (Dict[str, Any]): A plan from `load_plan`.
+        clients (Dict[str, Any]): Clients by endpoint name.
+    """
+    for dataset, endpoint in itertools.product(plan["datasets"], plan["endpoints"]):
+        params = ingest_params(dataset, endpoint)
+        marker = os.path.join(plan["output_dir"], "ingest", f"{fingerprint(params)}.json")
+        if os.path.exists(marker):
+            continue
+        df = load_data(dataset["document_file"])
+        upsert_documents(clients[endpoint["name"]], df, dataset["collection"])
+        os.makedirs(os.path.dirname(marker), exist_ok=True)
+        with open(marker, "w") as f:
+            json.dump(params, f, indent=2)
+
+
+def execute_plan(
+    plan: Dict[str, Any],
+    client_factory: Callable[[Dict[str, Any]], Any],
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Run every cell of a plan that has no result yet, in parallel, and collect all results.
+
+    Args:
+        plan (Dict[str, Any]): A plan from `load_plan`.
+        client_factory (Callable[[Dict[str, Any]], Any]): Builds a client for an endpoint entry;
+            one client is built per endpoint and shared by its cells.
+        max_workers (Optional[int], optional): Maximum number of cells run at once.
+            Defaults to the plan's 'max_workers'.
+
+    Returns:
+        pd.DataFrame: One row per cell of the plan, old and new.
+    """
+    cells = expand_cells(plan)
+    pending = pending_cells(plan, cells)
+    print(
+        f"Plan '{plan['name']}': {len(cells)} cells, "
+        f"{len(cells) - len(pending)} already done, {len(pending)} to run"
+    )
+
+    if pending or plan["upsert"]:
+        clients = {endpoint["name"]: client_factory(endpoint) for endpoint in plan["endpoints"]}
+        if plan["upsert"]:
+            ingest_datasets(plan, clients)
+
+        workers = max_workers or plan["max_workers"]
+
+        def run(cell: Dict[str, Any]) -> None:
+            try:
+                result = run_cell(cell, clients[cell["params"]["endpoint"]], workers)
+                save_cell(plan, cell, result)
+            except Exception as e:
+                print(f"Cell {cell['fingerprint']} ({cell['params']['dataset']}) failed: {e}")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, pending))
+
+    return collect_results(plan, cells)
+
+
+def collect_results(plan: Dict[str, Any], cells: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Gather the stored results of the given cells into one table.
+
+    Args:
+        plan (Dict[str, Any]): A plan from `load_plan`.
+        cells (List[Dict[str, Any]]): The cells to collect.
+
+    Returns:
+        pd.DataFrame: One row per finished cell with its parameters and summary results.
+    """
+    rows = []
+    for cell in cells:
+        path = cell_path(plan, cell)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            result = json.load(f)
+        summary = {k: v for k, v in result["results"].items() if k != "ndcg_scores"}
+        rows.append({"fingerprint": cell["fingerprint"], **cell["params"], **summary})
+    return pd.DataFrame(rows)
@@ -0,0 +1,198 @@
+import time
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+from src.document_manager import check_collection, upsert_row
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarise a list of latencies.
+
+    Args:
+        latencies (List[float]): Latencies in seconds.
+
+    Returns:
+        Dict[str, float]: Mean, p50, p95 and p99 latency in seconds.
+    """
+    if not latencies:
+        return {"mean": np.nan, "p50": np.nan, "p95": np.nan, "p99": np.nan}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {"mean": float(np.mean(latencies)), "p50": p50, "p95": p95, "p99": p99}
+
+
+def fit_growth_curve(sizes: List[float], values: List[float]) -> Dict[str, float]:
+    """
+    Fit a power law ``value = coefficient * size ** exponent`` in log-log space.
+
+    An exponent near 0 means the value does not grow with collection size, near 1
+    means it grows linearly.
+
+    Args:
+        sizes (List[float]): Collection sizes.
+        values (List[float]): The measured value at each size, e.g. p50 latency.
+
+    Returns:
+        Dict[str, float]: The coefficient, exponent and r2 of the fit (NaN if fewer than two distinct sizes).
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    values = np.asarray(values, dtype=float)
+    mask = (sizes > 0) & (values > 0) & np.isfinite(values)
+    if len(np.unique(sizes[mask])) < 2:
+        return {"coefficient": np.nan, "exponent": np.nan, "r2": np.nan}
+
+    log_x, log_y = np.log(sizes[mask]), np.log(values[mask])
+    exponent, intercept = np.polyfit(log_x, log_y, 1)
+    residuals = log_y - (exponent * log_x + intercept)
+    total = ((log_y - log_y.mean()) ** 2).sum()
+    r2 = 1 - (residuals**2).sum() / total if total else 1.0
+    return {"coefficient": float(np.exp(intercept)), "exponent": float(exponent), "r2": float(r2)}
+
+
+def predict_growth(fit: Dict[str, float], sizes: List[float]) -> List[float]:
+    """Evaluate a fitted growth curve at the given collection sizes."""
+    return [fit["coefficient"] * size ** fit["exponent"] for size in sizes]
+
+
+def measure_search_latency(
+    client: Any, queries: List[str], collection_name: str, top_k: int
+) -> List[float]:
+    """
+    Time one search per query against a collection.
+
+    Failed searches are reported and left out of the latencies.
+
+    Args:
+        client (Any): Search client to retrieve results.
+        queries (List[str]): The query texts.
+        collection_name (str): Name of the collection to search.
+        top_k (int): Number of top results to retrieve.
+
+    Returns:
+        List[float]: The latency of each successful search in seconds.
+    """
+    latencies = []
+    for query_text in queries:
+        try:
+            start = time.time()
+            client.search(query=query_text, collection_name=collection_name, top_k=top_k)
+            latencies.append(time.time() - start)
+        except Exception as e:
+            print(f"Failed to search '{query_text}' in {collection_name}: {e}")
+    return latencies
+
+
+def prepare_empty_collection(client: Any, collection_name: str, reset: bool = False) -> None:
+    """
+    Make sure a collection exists and holds no documents.
+
+    Args:
+        client (Any): The Colivara client.
+        collection_name (str): The collection to prepare.
+        reset (bool, optional): Delete and re-create the collection if it holds documents.
+            Defaults to False.
+
+    Raises:
+        ValueError: If the collection holds documents and `reset` is False.
+    """
+    if check_collection(client, collection_name):
+        num_documents = client.get_collection(collection_name).num_documents
+        if not num_documents:
+            return
+        if not reset:
+            raise ValueError(
+                f"Collection {collection_name} already holds {num_documents} documents; "
+                "reset it or pick another collection."
+            )
+        client.delete_collection(collection_name)
+    client.create_collection(collection_name)
+
+
+def run_scaling_benchmark(
+    client: Any,
+    df: pd.DataFrame,
+    queries: List[str],
+    collection_name: str,
+    sizes: List[int],
+    top_ks: List[int],
+    reset: bool = False,
+) -> pd.DataFrame:
+    """
+    Grow one collection through increasing sizes and measure search and ingest at each.
+
+    The collection must start empty. Sizes are nested prefixes of `df`, so each
+    step only upserts the documents added since the previous size. Ingest time is
+    the sum of the per-document encode and upsert times, so it leaves out any
+    collection-wide calls whose cost grows with the collection.
+
+    Args:
+        client (Any): The Colivara client.
+        df (pd.DataFrame): The documents, in ingest order.
+        queries (List[str]): The fixed query sample searched at every size.
+        collection_name (str): The collection to build.
+        sizes (List[int]): Collection sizes to measure at, in increasing order.
+        top_ks (List[int]): The top_k values to search with at each size.
+        reset (bool, optional): Delete and re-create the collection if it is not empty.
+            Defaults to False.
+
+    Returns:
+        pd.DataFrame: One row per (size, top_k) with latency and ingest throughput.
+
+    Raises:
+        ValueError: If the collection is not empty and `reset` is False.
+    """
+    prepare_empty_collection(client, collection_name, reset)
+    labels = {"collection": collection_name}
+    rows = []
+    ingested = 0
+    for size in tqdm(sizes, desc="Collection sizes"):
+        ingest_seconds = sum(
+            upsert_row(client, df, i, collection_name, labels)["total_seconds"]
+            for i in range(ingested, size)
+        )
+        added = size - ingested
+        ingested = size
+        num_documents = client.get_collection(collection_name).num_documents
+
+        for top_k in top_ks:
+            latencies = measure_search_latency(client, queries, collection_name, top_k)
+            summary = latency_summary(latencies)
+            rows.append(
+                {
+                    "size": size,
+                    "num_documents": num_documents,
+                    "top_k": top_k,
+                    "num_searches": len(latencies),
+                    "avg_latency": summary["mean"],
+                    "p50_latency": summary["p50"],
+                    "p95_latency": summary["p95"],
+                    "p99_latency": summary["p99"],
+                    "ingested_docs": added,
+                    "ingest_seconds": ingest_seconds,
+                    "ingest_docs_per_second": added / ingest_seconds if ingest_seconds else np.nan,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def fit_scaling_results(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fit growth curves of search latency per top_k, and of ingest throughput, against collection size.
+
+    Args:
+        results (pd.DataFrame): The output of `run_scaling_benchmark`.
+
+    Returns:
+        pd.DataFrame: One row per fitted metric with its coefficient, exponent and r2.
+    """
+    fits = []
+    for top_k, group in results.groupby("top_k"):
+        for metric in ("p50_latency", "p95_latency"):
+            fit = fit_growth_curve(group["num_documents"], group[metric])
+            fits.append({"metric": metric, "top_k": top_k, **fit})
+
+    per_size = results.drop_duplicates("size")
+    fit = fit_growth_curve(per_size["num_documents"], per_size["ingest_docs_per_second"])
+    fits.append({"metric": "ingest_docs_per_second", "top_k": None, **fit})
+    return pd.DataFrame(fits)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.ab_evaluator import evaluate_ab, paired_difference, summarize_ab
+
+
+class MockResult:
+    def __init__(self, image_file_name):
+        self.raw_score = 1.0
+        self.document_metadata = {"image_file_name": image_file_name}
+
+
+class MockSearchResults:
+    def __init__(self, names):
+        self.results = [MockResult(name) for name in names]
+
+
+class MockClient:
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+
+    def search(self, query, collection_name, top_k):
+        self.calls += 1
+        return MockSearchResults(self.names)
+
+
+@pytest.fixture
+def queries_df():
+    return pd.DataFrame(
+        {"query": ["q1", "q2", "q1"], "image_filename": ["1", "2", "2"]}
+    )
+
+
+@pytest.mark.parametrize("mode", ["interleaved", "concurrent"])
+def test_evaluate_ab_pairs_results(queries_df, mode):
+    client_a = MockClient(["1", "2", "3"])
+    client_b = MockClient(["2", "1", "3"])
+
+    results = evaluate_ab(queries_df, client_a, client_b, "coll", top_k=3, mode=mode)
+
+    assert client_a.calls == client_b.calls == 2
+    assert list(results["ndcg_a"]) == pytest.approx([1.0, 0.6309, 0.6309], 0.001)
+    assert list(results["ndcg_b"]) == pytest.approx([0.6309, 1.0, 1.0], 0.001)
+    assert results["latency_a"].notna().all()
+    assert results["latency_b"].notna().all()
+
+
+def test_evaluate_ab_unknown_mode(queries_df):
+    with pytest.raises(ValueError):
+        evaluate_ab(queries_df, MockClient([]), MockClient([]), "coll", mode="bad")
+
+
+def test_paired_difference_detects_shift():
+    rng = np.random.default_rng(1)
+    a = rng.normal(1.0, 0.5, 200)
+    b = a + 0.1 + rng.normal(0, 0.01, 200)
+    summary = paired_difference(a, b)
+    assert summary["n"] == 200
+    assert summary["mean_diff"] == pytest.approx(0.1, abs=0.01)
+    assert summary["ci_low"] > 0
+
+
+def test_paired_difference_drops_nan_pairs():
+    summary = paired_difference([1.0, np.nan, 3.0], [2.0, 5.0, np.nan])
+    assert summary["n"] == 1
+    assert summary["mean_diff"] == 1.0
+
+
+def test_summarize_ab():
+    results = pd.DataFrame(
+        {
+            "query": ["q1", "q2"],
+            "ndcg_a": [1.0, 1.0],
+            "ndcg_b": [1.0, 1.0],
+            "latency_a": [0.1, 0.2],
+            "latency_b": [0.3, 0.4],
+        }
+    )
+    summary = summarize_ab(results).set_index("metric")
+    assert not summary.loc["ndcg", "significant"]
+    assert summary.loc["latency", "significant"]
+
+
+def test_summarize_ab_pairs_latency_once_per_search():
+    # q1 was searched once and copied onto three rows with different targets
+    results = pd.DataFrame(
+        {
+            "query": ["q1", "q1", "q1", "q2"],
+            "ndcg_a": [1.0, 0.0, 0.0, 1.0],
+            "ndcg_b": [1.0, 1.0, 0.0, 1.0],
+            "latency_a": [0.1, 0.1, 0.1, 0.2],
+            "latency_b": [0.3, 0.3, 0.3, 0.5],
+        }
+    )
+    summary = summarize_ab(results).set_index("metric")
+    assert summary.loc["ndcg", "n"] == 4
+    assert summary.loc["latency", "n"] == 2
+    assert summary.loc["latency", "mean_diff"] == pytest.approx(0.25)
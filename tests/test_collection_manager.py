@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+import pytest
+from collection_manager import (
+    collection_stats,
+    create_collections,
+    delete_collections,
+    match_collections,
+    reset_collections,
+)
+
+
+def make_collection(name, num_documents=0):
+    collection = MagicMock()
+    collection.name = name
+    collection.num_documents = num_documents
+    return collection
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.list_collections.return_value = [
+        make_collection("syntheticDocQA_energy_test", 10),
+        make_collection("syntheticDocQA_healthcare_industry_test", 20),
+        make_collection("tatdqa_test", 30),
+    ]
+    return client
+
+
+def test_match_collections():
+    names = ["syntheticDocQA_energy_test", "tatdqa_test", "docvqa_test_subsampled"]
+    assert match_collections(names, ["syntheticDocQA_*", "tat*"]) == [
+        "syntheticDocQA_energy_test",
+        "tatdqa_test",
+    ]
+
+
+def test_delete_collections_lists_once(client):
+    results = delete_collections(client, ["syntheticDocQA_*"])
+    assert set(results) == {
+        "syntheticDocQA_energy_test",
+        "syntheticDocQA_healthcare_industry_test",
+    }
+    client.list_collections.assert_called_once()
+    assert client.delete_collection.call_count == 2
+
+
+def test_delete_collections_reports_errors(client):
+    client.delete_collection.side_effect = RuntimeError("boom")
+    results = delete_collections(client, ["tatdqa_test"])
+    assert isinstance(results["tatdqa_test"], RuntimeError)
+
+
+def test_create_collections_skips_existing(client):
+    create_collections(client, ["tatdqa_test", "new_collection"])
+    client.create_collection.assert_called_once_with("new_collection")
+
+
+def test_reset_collections(client):
+    reset_collections(client, ["tatdqa_test"])
+    client.delete_collection.assert_called_once_with("tatdqa_test")
+    client.create_collection.assert_called_once_with("tatdqa_test")
+
+
+def test_collection_stats(client):
+    doc = MagicMock()
+    doc.num_pages = 2
+    client.list_documents.return_value = [doc, doc]
+    stats = collection_stats(client, ["tatdqa_test"])
+    assert stats == [{"name": "tatdqa_test", "num_documents": 30, "num_pages": 4}]
@@ -2,7 +2,13 @@ from pathlib import Path
 import pytest
 import pandas as pd
 import base64
-from src.data_loader import read_pickle_file, process_data, load_data
+from src.data_loader import (
+    read_pickle_file,
+    process_data,
+    load_data,
+    image_content_hash,
+    deduplicate_pages,
+)
 from typing import Any
 
 
@@ -89,3 +95,27 @@ def test_load_data_runtime_error(mocker, sample_pickle_file: Any):
     mocker.patch("pandas.read_pickle", side_effect=Exception("Mocked error"))
     with pytest.raises(RuntimeError, match="Failed to load data: Mocked error"):
         load_data(sample_pickle_file)
+
+
+def test_image_content_hash_matches_identical_images():
+    assert image_content_hash({"bytes": b"page"}) == image_content_hash(
+        {"bytes": b"page"}
+    )
+    assert image_content_hash({"bytes": b"page"}) != image_content_hash(
+        {"bytes": b"other"}
+    )
+
+
+def test_deduplicate_pages_collects_filenames():
+    df = pd.DataFrame(
+        {
+            "id": [0, 1, 2],
+            "image": [{"bytes": b"a"}, {"bytes": b"b"}, {"bytes": b"a"}],
+            "image_filename": ["a1.png", "b.png", "a2.png"],
+        }
+    )
+    deduped = deduplicate_pages(df)
+    assert len(deduped) == 2
+    assert list(deduped["id"]) == [0, 1]
+    assert deduped["image_filenames"][0] == ["a1.png", "a2.png"]
+    assert deduped["image_filenames"][1] == ["b.png"]
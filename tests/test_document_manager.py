@@ -108,3 +108,81 @@ def test_upsert_documents_progress_bar(client, df, collection_name, mocker):
         upsert_documents(client, df, collection_name)
 
     tqdm_mock.assert_called_once_with(range(len(df)), desc="Upserting documents")
+
+
+def test_upsert_documents_writes_profile(client, collection_name, tmp_path):
+    from PIL import Image
+
+    df = pd.DataFrame(
+        {
+            "id": [1, 2],
+            "image": [Image.new("RGB", (4, 3)), Image.new("RGB", (8, 6))],
+            "image_filename": ["image1.png", "image2.png"],
+        }
+    )
+    profile_path = tmp_path / "profile.parquet"
+    upsert_documents(client, df, collection_name, profile_path=str(profile_path))
+
+    profile = pd.read_parquet(profile_path)
+    assert list(profile["doc_id"]) == ["1", "2"]
+    assert list(profile["pixels"]) == [12, 48]
+    assert (profile["encoded_bytes"] > 0).all()
+    assert profile["index_wait_seconds"].isna().all()
+    assert client.upsert_document.call_args.kwargs["wait"] is True
+
+
+def test_upsert_documents_measures_index_wait(client, collection_name, mocker):
+    from PIL import Image
+
+    mocker.patch("src.document_manager.time.sleep")
+    client.get_document.side_effect = [
+        Exception("not found"),
+        Exception("not found"),
+        MagicMock(num_pages=1),
+    ]
+    df = pd.DataFrame(
+        {"id": [1], "image": [Image.new("RGB", (4, 3))], "image_filename": ["image1.png"]}
+    )
+    upsert_documents(client, df, collection_name, measure_index_wait=True)
+
+    assert client.upsert_document.call_args.kwargs["wait"] is False
+    assert client.get_document.call_count == 3
+    client.delete_document.assert_not_called()
+
+
+def test_upsert_documents_index_wait_deletes_existing_document(client, collection_name, mocker):
+    from PIL import Image
+
+    mocker.patch("src.document_manager.time.sleep")
+    old_version = MagicMock(num_pages=1)
+    client.get_document.side_effect = [old_version, Exception("not found"), MagicMock(num_pages=1)]
+    df = pd.DataFrame(
+        {"id": [1], "image": [Image.new("RGB", (4, 3))], "image_filename": ["image1.png"]}
+    )
+    upsert_documents(client, df, collection_name, measure_index_wait=True)
+
+    client.delete_document.assert_called_once_with("1", collection_name=collection_name)
+    assert client.get_document.call_count == 3
+
+
+def test_upsert_documents_paces_documents(client, collection_name, mocker):
+    from PIL import Image
+
+    sleep = mocker.patch("src.document_manager.time.sleep")
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "image": [Image.new("RGB", (4, 3))] * 3,
+            "image_filename": ["image1.png", "image2.png", "image3.png"],
+        }
+    )
+    upserted = []
+    upsert_documents(client, df, collection_name, docs_per_second=2, on_upserted=upserted.append)
+
+    assert client.upsert_document.call_count == 3
+    assert [record["doc_id"] for record in upserted] == ["1", "2", "3"]
+    # the first document starts at once, the others on a 0.5s schedule
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert delays[0] == 0.0
+    assert delays[1] == pytest.approx(0.5, abs=0.1)
+    assert delays[2] == pytest.approx(1.0, abs=0.1)
@@ -0,0 +1,84 @@
+import os
+import pytest
+from src.data_loader import read_pickle_file
+from src.download_datasets import download_dataset, read_manifest, write_manifest
+
+
+class FakeStream:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def skip(self, n):
+        return FakeStream(self.rows[n:])
+
+    def iter(self, batch_size):
+        for start in range(0, len(self.rows), batch_size):
+            batch = self.rows[start : start + batch_size]
+            yield {"query": [row["query"] for row in batch]}
+
+
+@pytest.fixture
+def rows():
+    return [{"query": f"q{i}"} for i in range(5)]
+
+
+@pytest.fixture
+def load_dataset(mocker, rows):
+    return mocker.patch(
+        "src.download_datasets.load_dataset", side_effect=lambda *a, **k: FakeStream(rows)
+    )
+
+
+def test_download_dataset_writes_parts_and_manifest(tmp_path, load_dataset):
+    manifest = download_dataset("vidore/fake_test", str(tmp_path), batch_size=2)
+    assert manifest["complete"]
+    assert manifest["num_rows"] == 5
+    assert [part["rows"] for part in manifest["parts"]] == [2, 2, 1]
+    assert read_manifest(str(tmp_path / "fake_test")) == manifest
+
+    df = read_pickle_file(str(tmp_path / "fake_test.pkl"))
+    assert list(df["query"]) == [f"q{i}" for i in range(5)]
+    assert list(df["id"]) == list(range(5))
+
+
+def test_download_dataset_skips_complete(tmp_path, load_dataset):
+    download_dataset("vidore/fake_test", str(tmp_path), batch_size=2)
+    download_dataset("vidore/fake_test", str(tmp_path), batch_size=2)
+    assert load_dataset.call_count == 1
+
+
+def test_download_dataset_resumes_after_corrupt_part(tmp_path, load_dataset, mocker):
+    download_dataset("vidore/fake_test", str(tmp_path), batch_size=2)
+    with open(tmp_path / "fake_test" / "part-00001.pkl", "wb") as f:
+        f.write(b"corrupt")
+    skip = mocker.spy(FakeStream, "skip")
+
+    manifest = download_dataset("vidore/fake_test", str(tmp_path), batch_size=2)
+    skip.assert_called_once()
+    assert skip.call_args[0][1] == 2
+    assert manifest["num_rows"] == 5
+    assert os.path.exists(tmp_path / "fake_test" / "part-00002.pkl")
+    df = read_pickle_file(str(tmp_path / "fake_test"))
+    assert list(df["query"]) == [f"q{i}" for i in range(5)]
+
+
+def test_download_dataset_resume_with_new_batch_size_drops_stale_parts(tmp_path, load_dataset):
+    download_dataset("vidore/fake_test", str(tmp_path), batch_size=2)
+    with open(tmp_path / "fake_test" / "part-00001.pkl", "wb") as f:
+        f.write(b"corrupt")
+
+    manifest = download_dataset("vidore/fake_test", str(tmp_path), batch_size=5)
+    assert [part["rows"] for part in manifest["parts"]] == [2, 3]
+    assert not os.path.exists(tmp_path / "fake_test" / "part-00002.pkl")
+    df = read_pickle_file(str(tmp_path / "fake_test.pkl"))
+    assert list(df["query"]) == [f"q{i}" for i in range(5)]
+
+
+def test_read_pickle_file_refuses_incomplete_download(tmp_path, load_dataset):
+    download_dataset("vidore/fake_test", str(tmp_path), batch_size=2)
+    manifest = read_manifest(str(tmp_path / "fake_test"))
+    manifest["complete"] = False
+    write_manifest(str(tmp_path / "fake_test"), manifest)
+
+    with pytest.raises(RuntimeError, match="incomplete"):
+        read_pickle_file(str(tmp_path / "fake_test.pkl"))
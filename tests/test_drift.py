@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.drift import (
+    compare_runs,
+    jaccard_at_k,
+    ks_statistic,
+    load_rankings,
+    rank_biased_overlap,
+    ranking_records,
+    save_rankings,
+)
+
+
+class MockResult:
+    def __init__(self, document_name, raw_score, page_number=1):
+        self.document_name = document_name
+        self.page_number = page_number
+        self.raw_score = raw_score
+        self.document_metadata = {"image_file_name": f"{document_name}.png"}
+
+
+def make_rankings(rankings):
+    records = []
+    for query, names in rankings.items():
+        results = [MockResult(name, 10.0 - i) for i, name in enumerate(names)]
+        records.extend(ranking_records(query, results))
+    return pd.DataFrame(records)
+
+
+def test_save_and_load_rankings(tmp_path):
+    records = ranking_records("q", [MockResult("1", 2.0), MockResult("2", 1.0)])
+    path = str(tmp_path / "rankings.parquet")
+    save_rankings(records, path)
+    rankings = load_rankings(path)
+    assert list(rankings["rank"]) == [1, 2]
+    assert list(rankings["image_file_name"]) == ["1.png", "2.png"]
+
+
+def test_rank_biased_overlap_identical_and_disjoint():
+    a = np.array([[0, 1, 2], [0, 1, 2]])
+    b = np.array([[0, 1, 2], [3, 4, 5]])
+    rbo = rank_biased_overlap(a, b, p=0.9)
+    assert rbo[0] == pytest.approx(1.0)
+    assert rbo[1] == pytest.approx(0.0)
+
+
+def test_rank_biased_overlap_penalises_top_swaps_more():
+    a = np.array([[0, 1, 2, 3], [0, 1, 2, 3]])
+    b = np.array([[1, 0, 2, 3], [0, 1, 3, 2]])
+    rbo = rank_biased_overlap(a, b, p=0.9)
+    assert rbo[0] < rbo[1] < 1.0
+
+
+def test_jaccard_at_k_handles_padding():
+    a = np.array([[0, 1, 2], [0, -1, -1]])
+    b = np.array([[2, 3, 0], [0, -1, -1]])
+    assert list(jaccard_at_k(a, b)) == pytest.approx([0.5, 1.0])
+
+
+def test_ks_statistic():
+    assert ks_statistic(np.array([1.0, 2.0]), np.array([1.0, 2.0])) == 0.0
+    assert ks_statistic(np.array([1.0, 2.0]), np.array([3.0, 4.0])) == 1.0
+
+
+def test_compare_runs():
+    run_a = make_rankings({"q1": ["a", "b", "c"], "q2": ["d", "e", "f"], "q3": ["x"]})
+    run_b = make_rankings({"q1": ["a", "b", "c"], "q2": ["e", "d", "g"]})
+
+    per_query, summary = compare_runs(run_a, run_b, k=3)
+
+    assert list(per_query["query"]) == ["q1", "q2"]
+    assert per_query["rbo"][0] == pytest.approx(1.0)
+    assert per_query["rbo"][1] < 1.0
+    assert list(per_query["jaccard"]) == pytest.approx([1.0, 0.5])
+    assert list(per_query["top1_changed"]) == [False, True]
+    assert summary["num_queries"] == 2
+    assert summary["only_in_a"] == 1
+    assert summary["top1_change_rate"] == 0.5
+
+
+def test_compare_runs_with_repeated_documents():
+    # a multi-page document filling several ranks of one query
+    def pages(items):
+        return [MockResult(name, 10.0 - i, page) for i, (name, page) in enumerate(items)]
+
+    run = pd.DataFrame(ranking_records("q", pages([("d1", 1), ("d1", 2), ("d1", 3)])))
+    per_query, _ = compare_runs(run, run, k=3)
+    assert per_query["rbo"].iloc[0] == pytest.approx(1.0)
+    assert per_query["jaccard"].iloc[0] == 1.0
+
+    # without page numbers, repeats are kept at their first rank only
+    a = run.drop(columns="page_number")
+    per_query, _ = compare_runs(a, a, k=3)
+    assert 0 <= per_query["rbo"].iloc[0] <= 1
+    assert per_query["jaccard"].iloc[0] == 1.0
+
+    b = pd.DataFrame(ranking_records("q", pages([("d1", 1), ("d2", 1), ("d1", 2)])))
+    per_query, _ = compare_runs(run, b, k=3)
+    assert 0 <= per_query["rbo"].iloc[0] <= 1
+    assert 0 <= per_query["jaccard"].iloc[0] <= 1
@@ -1,5 +1,5 @@
 import pytest
-from src.evaluator import dcg, ndcg_at_k, evaluate_rag_model
+from src.evaluator import dcg, ndcg_at_k, evaluate_rag_model, is_relevant
 import pandas as pd
 
 
@@ -33,6 +33,14 @@ def test_ndcg_at_k():
     assert ndcg_at_k(results, true_doc_id, k=3) == pytest.approx(0.6309, 0.001)
 
 
+def test_is_relevant_multi_filename():
+    metadata = {"image_file_name": "a1.png", "image_file_names": ["a1.png", "a2.png"]}
+    assert is_relevant(metadata, "a1.png")
+    assert is_relevant(metadata, "a2.png")
+    assert not is_relevant(metadata, "b.png")
+    assert is_relevant({"image_file_name": "b.png"}, "b.png")
+
+
 def test_evaluate_rag_model():
     # Mocked data for queries and expected true document IDs
     queries_data = {"query": ["query1", "query2"], "id": [1, 2]}
@@ -55,3 +63,61 @@ def test_evaluate_rag_model():
     assert len(ndcg_scores) == len(queries_df)
     assert ndcg_scores[0] == 1.0
     assert ndcg_scores[1] == pytest.approx(0.6309, 0.001)
+
+
+class CountingClient(MockClient):
+    def __init__(self):
+        self.calls = 0
+
+    def search(self, query, collection_name, top_k):
+        self.calls += 1
+        results = MockSearchResults()
+        for result in results.results:
+            result.raw_score = 1.0
+            result.document_metadata = {"image_file_name": result.document_name}
+        return results
+
+
+def test_evaluate_rag_model_deduplicates_queries():
+    queries_df = pd.DataFrame(
+        {"query": ["q1", "q2", "q1"], "image_filename": ["1", "3", "2"]}
+    )
+    client = CountingClient()
+
+    mean_ndcg, ndcg_scores, _, api_calls_saved = evaluate_rag_model(
+        queries_df, client, "test_collection", top_k=3
+    )
+
+    assert client.calls == 2
+    assert api_calls_saved == 1
+    assert ndcg_scores[0] == 1.0
+    assert ndcg_scores[1] == pytest.approx(0.5, 0.001)
+    assert ndcg_scores[2] == pytest.approx(0.6309, 0.001)
+    assert mean_ndcg == pytest.approx(sum(ndcg_scores) / 3)
+
+
+def test_evaluate_rag_model_without_deduplication():
+    queries_df = pd.DataFrame({"query": ["q1", "q1"], "image_filename": ["1", "2"]})
+    client = CountingClient()
+
+    _, _, _, api_calls_saved = evaluate_rag_model(
+        queries_df, client, "test_collection", top_k=3, deduplicate_queries=False
+    )
+
+    assert client.calls == 2
+    assert api_calls_saved == 0
+
+
+def test_search_retries_are_labelled_with_collection(mocker):
+    from tenacity import wait_none
+    from unittest.mock import MagicMock
+    from src.evaluator import get_search_results
+    from src.metrics import REGISTRY
+
+    mocker.patch.object(get_search_results.retry, "wait", wait_none())
+    client = MagicMock()
+    client.search.side_effect = [Exception("timeout"), MagicMock(results=[1, 2])]
+    get_search_results(client, "q", "retry_coll", 2)
+
+    retries = REGISTRY.snapshot()["counters"]["evaluator_search_retries_total"]
+    assert {"labels": {"collection": "retry_coll"}, "value": 1} in retries
@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+import pandas as pd
+import pytest
+from src.filter_benchmark import (
+    run_filter_benchmark,
+    selectivity_filter,
+    selectivity_tags,
+    tag_collection,
+)
+
+
+class MockResult:
+    def __init__(self, metadata):
+        self.raw_score = 1.0
+        self.document_metadata = metadata
+
+
+def test_selectivity_tags_are_nested_and_proportional():
+    tags = [selectivity_tags(str(i), [10, 50, 100]) for i in range(2000)]
+    counts = {key: sum(key in t for t in tags) for key in ("sel_10", "sel_50", "sel_100")}
+    assert counts["sel_100"] == 2000
+    assert counts["sel_50"] == pytest.approx(1000, rel=0.1)
+    assert counts["sel_10"] == pytest.approx(200, rel=0.2)
+    assert all("sel_50" in t for t in tags if "sel_10" in t)
+
+
+def test_selectivity_filter():
+    assert selectivity_filter(25) == {
+        "on": "document",
+        "key": "sel_25",
+        "value": True,
+        "lookup": "key_lookup",
+    }
+
+
+def test_tag_collection_keeps_metadata_and_skips_tagged():
+    tagged = MagicMock(metadata={"doc_id": "1", **selectivity_tags("1", [100])})
+    tagged.name = "1"
+    untagged = MagicMock(metadata={"doc_id": "2", "image_file_name": "b.png"})
+    untagged.name = "2"
+    client = MagicMock()
+    client.list_documents.return_value = [tagged, untagged]
+
+    metadata = tag_collection(client, "coll", levels=[100])
+
+    client.partial_update_document.assert_called_once_with(
+        "2",
+        metadata={"doc_id": "2", "image_file_name": "b.png", "sel_100": True},
+        collection_name="coll",
+    )
+    assert metadata[1]["sel_100"] is True
+
+
+def test_run_filter_benchmark():
+    documents_metadata = [
+        {"image_file_name": "a.png", "sel_100": True},
+        {"image_file_name": "b.png", "sel_100": True},
+    ]
+    client = MagicMock()
+    client.search.return_value.results = [MockResult(documents_metadata[0])]
+    queries_df = pd.DataFrame({"query": ["q1", "q2"], "image_filename": ["a.png", "b.png"]})
+
+    results = run_filter_benchmark(
+        client, queries_df, "coll", documents_metadata, levels=[100], top_k=1
+    )
+
+    assert list(results["selectivity"].fillna(-1)) == [-1, 100]
+    assert client.search.call_count == 4
+    assert client.search.call_args.kwargs["query_filter"] == selectivity_filter(100)
+    assert list(results["ndcg"]) == [0.5, 0.5]
+    assert list(results["queries_in_subset"]) == [2, 2]
+    assert list(results["subset_fraction"]) == [1.0, 1.0]
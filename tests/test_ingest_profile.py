@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+from PIL import Image
+from src.ingest_profile import (
+    estimate_ingest_time,
+    fit_ingest_model,
+    image_dimensions,
+    load_profile,
+    save_profile,
+)
+
+
+def make_record(doc_id, pixels, total_seconds):
+    return {
+        "doc_id": str(doc_id),
+        "image_filename": f"{doc_id}.png",
+        "width": pixels,
+        "height": 1,
+        "pixels": pixels,
+        "encoded_bytes": 100,
+        "encode_seconds": 0.1,
+        "upload_seconds": total_seconds - 0.1,
+        "index_wait_seconds": float("nan"),
+        "total_seconds": total_seconds,
+    }
+
+
+def test_image_dimensions():
+    assert image_dimensions(Image.new("RGB", (20, 10))) == {
+        "width": 20,
+        "height": 10,
+        "pixels": 200,
+    }
+
+
+def test_save_profile_appends(tmp_path):
+    path = str(tmp_path / "profile.parquet")
+    save_profile([make_record(1, 1_000_000, 1.0)], path)
+    save_profile([make_record(2, 2_000_000, 2.0)], path)
+    profile = load_profile(path)
+    assert list(profile["doc_id"]) == ["1", "2"]
+
+
+def test_load_profile_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_profile(str(tmp_path / "missing.parquet"))
+
+
+def test_fit_and_estimate():
+    profile = pd.DataFrame(
+        [make_record(i, i * 1_000_000, 0.5 + 1.0 * i) for i in range(1, 5)]
+    )
+    model = fit_ingest_model(profile)
+    assert model["intercept"] == pytest.approx(0.5)
+    assert model["slope"] == pytest.approx(1.0)
+
+    df = pd.DataFrame({"image": [Image.new("RGB", (1000, 1000))] * 3})
+    estimate = estimate_ingest_time(df, profile)
+    assert estimate["num_documents"] == 3
+    assert estimate["predicted_seconds"] == pytest.approx(4.5)
+    assert estimate["lower_seconds"] <= 4.5 <= estimate["upper_seconds"]
+
+
+def test_fit_ingest_model_single_size():
+    profile = pd.DataFrame([make_record(i, 1_000_000, 2.0) for i in range(3)])
+    model = fit_ingest_model(profile)
+    assert model["intercept"] == pytest.approx(2.0)
+    assert model["slope"] == 0.0
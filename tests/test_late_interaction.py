@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from src.late_interaction import (
+    evaluate_local,
+    load_embedding_cache,
+    maxsim_scores,
+    save_embedding_cache,
+    top_k_results,
+)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def make_cache(tmp_path, name, rng, lengths, metadata):
+    embeddings = [rng.standard_normal((n, 8)).astype(np.float16) for n in lengths]
+    ids = [str(i) for i in range(len(lengths))]
+    return save_embedding_cache(str(tmp_path / name), embeddings, ids, metadata)
+
+
+def naive_maxsim(queries, pages):
+    scores = np.zeros((len(queries), len(pages)))
+    for q in range(len(queries)):
+        qv = np.asarray(queries.vectors[queries.offsets[q] : queries.offsets[q + 1]], dtype=np.float32)
+        for p in range(len(pages)):
+            pv = np.asarray(pages.vectors[pages.offsets[p] : pages.offsets[p + 1]], dtype=np.float32)
+            scores[q, p] = (qv @ pv.T).max(axis=1).sum()
+    return scores
+
+
+def test_save_and_load_embedding_cache(tmp_path, rng):
+    cache = make_cache(tmp_path, "pages", rng, [3, 5], [{"a": 1}, {"a": 2}])
+    loaded = load_embedding_cache(str(tmp_path / "pages"))
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.vectors.dtype == np.float16
+    assert list(loaded.offsets) == [0, 3, 8]
+    assert loaded.metadata == [{"a": 1}, {"a": 2}]
+    np.testing.assert_array_equal(loaded.vectors, cache.vectors)
+
+
+def test_load_embedding_cache_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_embedding_cache(str(tmp_path / "missing"))
+
+
+def test_maxsim_scores_matches_naive_across_chunks(tmp_path, rng):
+    queries = make_cache(tmp_path, "queries", rng, [4, 2, 6], [{}] * 3)
+    pages = make_cache(tmp_path, "pages", rng, [5, 1, 7, 3, 9], [{}] * 5)
+    expected = naive_maxsim(queries, pages)
+    scores = maxsim_scores(queries, pages, page_chunk_tokens=8, query_chunk_tokens=5)
+    np.testing.assert_allclose(scores, expected, rtol=1e-4, atol=1e-4)
+
+
+def test_top_k_results_ranks_best_first(tmp_path, rng):
+    pages = make_cache(tmp_path, "pages", rng, [1, 1, 1], [{"n": 0}, {"n": 1}, {"n": 2}])
+    scores = np.array([[0.1, 0.9, 0.5]], dtype=np.float32)
+    results = top_k_results(scores, pages, top_k=2)
+    assert [r.document_name for r in results[0]] == ["1", "2"]
+    assert results[0][0].document_metadata == {"n": 1}
+
+
+def test_evaluate_local(tmp_path, rng):
+    pages = make_cache(
+        tmp_path,
+        "pages",
+        rng,
+        [1, 1],
+        [{"image_file_name": "a.png"}, {"image_file_name": "b.png"}],
+    )
+    queries = make_cache(
+        tmp_path, "queries", rng, [1, 1], [{"image_filename": "a.png"}, {"image_filename": "b.png"}]
+    )
+    scores = np.array([[2.0, 1.0], [2.0, 1.0]], dtype=np.float32)
+    mean_ndcg, ndcg_scores = evaluate_local(queries, pages, top_k=2, scores=scores)
+    assert ndcg_scores[0] == 1.0
+    assert ndcg_scores[1] == pytest.approx(0.6309, 0.001)
+    assert mean_ndcg == pytest.approx(np.mean(ndcg_scores))
@@ -0,0 +1,74 @@
+import json
+import urllib.request
+import pytest
+from src.metrics import MetricsRegistry, StatsFileWriter, retry_labels, start_metrics_server
+
+
+def test_counters_gauges_and_histograms():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.inc("queries_total", labels={"collection": "c"})
+    registry.inc("queries_total", labels={"collection": "c"})
+    registry.add("in_flight", 1)
+    registry.add("in_flight", -1)
+    registry.set("running_ndcg", 0.5)
+    registry.observe("latency_seconds", 0.05)
+    registry.observe("latency_seconds", 0.5)
+
+    text = registry.render_prometheus()
+    assert 'queries_total{collection="c"} 2' in text
+    assert "in_flight 0" in text
+    assert "running_ndcg 0.5" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+
+
+def test_rates():
+    registry = MetricsRegistry(rate_window=60.0)
+    for _ in range(3):
+        registry.mark("queries")
+    rate = registry.snapshot()["rates"]["queries"][0]["value"]
+    assert rate > 0
+    assert "queries_per_second" in registry.render_prometheus()
+
+
+def test_mark_counts_events():
+    registry = MetricsRegistry(rate_window=60.0)
+    registry.mark("queries", count=3)
+    registry.mark("searches")
+    rates = registry.snapshot()["rates"]
+    assert rates["queries"][0]["value"] == pytest.approx(3 * rates["searches"][0]["value"])
+
+
+def test_stats_file_writer(tmp_path):
+    registry = MetricsRegistry()
+    registry.inc("documents_total", 4)
+    path = tmp_path / "stats.json"
+    writer = StatsFileWriter(str(path), interval=60.0, registry=registry).start()
+    writer.stop()
+    stats = json.loads(path.read_text())
+    assert stats["counters"]["documents_total"] == [{"labels": {}, "value": 4}]
+
+
+def test_metrics_server():
+    registry = MetricsRegistry()
+    registry.inc("documents_total")
+    server = start_metrics_server(0, registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        body = urllib.request.urlopen(url).read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert "documents_total 1" in body
+
+
+def test_retry_labels_by_keyword_or_position():
+    class State:
+        def __init__(self, args, kwargs):
+            self.args = args
+            self.kwargs = kwargs
+
+    assert retry_labels(State(("c", "q", "coll"), {}), 2) == {"collection": "coll"}
+    assert retry_labels(State((), {"collection_name": "coll"}), 2) == {"collection": "coll"}
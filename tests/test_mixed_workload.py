@@ -0,0 +1,93 @@
+import time
+from unittest.mock import MagicMock
+import pandas as pd
+import pytest
+from src.mixed_workload import run_mixed_workload, run_search_load, summarize_mixed_workload
+
+
+class MockResult:
+    def __init__(self, image_file_name):
+        self.document_metadata = {"image_file_name": image_file_name}
+        self.raw_score = 1.0
+
+
+def make_client(results=("a.png",)):
+    client = MagicMock()
+    client.search.return_value.results = [MockResult(name) for name in results]
+    return client
+
+
+def make_queries():
+    return pd.DataFrame({"query": ["q1", "q2", "q3"], "image_filename": ["a.png", "b.png", "a.png"]})
+
+
+def test_run_search_load_searches_each_query_once():
+    searches = run_search_load(make_client(), make_queries(), "coll", 5, qps=100)
+    assert list(searches["query"]) == ["q1", "q2", "q3"]
+    assert list(searches["ndcg"]) == [1.0, 0.0, 1.0]
+    assert searches["offset"].tolist() == pytest.approx([0.0, 0.01, 0.02])
+    assert not searches["error"].any()
+
+
+def test_run_search_load_records_errors():
+    client = make_client()
+    client.search.side_effect = Exception("overloaded")
+    searches = run_search_load(client, make_queries(), "coll", 5, qps=100)
+    assert searches["error"].all()
+    assert (searches["ndcg"] == 0).all()
+
+
+def test_run_mixed_workload_searches_during_ingest(mocker):
+    def slow_upsert(client, df, collection_name, docs_per_second=None, on_upserted=None):
+        for _ in range(len(df)):
+            time.sleep(0.025)
+            on_upserted({})
+
+    upsert = mocker.patch("src.mixed_workload.upsert_documents", side_effect=slow_upsert)
+    ingest_df = pd.DataFrame({"id": range(4)})
+
+    searches = run_mixed_workload(
+        make_client(), make_queries(), "search", ingest_df, "ingest", qps=100, docs_per_second=2
+    )
+
+    assert upsert.call_args.args[2] == "ingest"
+    assert upsert.call_args.kwargs["docs_per_second"] == 2
+    assert (searches["phase"] == "baseline").sum() == 3
+    # the loaded phase cycles through the queries until the ingest ends
+    assert (searches["phase"] == "under_ingest").sum() > 3
+    assert searches.attrs["ingest"]["documents"] == 4
+    assert searches.attrs["ingest"]["error"] is None
+
+
+def test_summarize_mixed_workload():
+    searches = pd.DataFrame(
+        {
+            "query": ["q1", "q2", "q1", "q1", "q3"],
+            "offset": [0.0, 1.0, 0.0, 0.5, 1.0],
+            "lag": [0.0] * 5,
+            "latency": [1.0, 1.0, 2.0, 2.0, 2.0],
+            "ndcg": [1.0, 0.0, 0.5, 1.0, 0.0],
+            "error": [False] * 5,
+            "phase": ["baseline", "baseline", "under_ingest", "under_ingest", "under_ingest"],
+        }
+    )
+    summary = summarize_mixed_workload(searches).set_index("phase")
+    assert summary.loc["baseline", "num_searches"] == 2
+    assert summary.loc["under_ingest", "achieved_qps"] == 2.0
+    # NDCG only over queries searched in both phases (q1), averaged per query
+    assert summary.loc["baseline", "ndcg"] == 1.0
+    assert summary.loc["under_ingest", "ndcg"] == 0.75
+    assert summary.loc["ratio", "p50_latency"] == 2.0
+
+
+def test_run_mixed_workload_counts_documents_upserted_before_failure(mocker):
+    def failing_upsert(client, df, collection_name, docs_per_second=None, on_upserted=None):
+        on_upserted({})
+        raise RuntimeError("server error")
+
+    mocker.patch("src.mixed_workload.upsert_documents", side_effect=failing_upsert)
+    searches = run_mixed_workload(
+        make_client(), make_queries(), "search", pd.DataFrame({"id": range(4)}), "ingest", 100, None
+    )
+    assert searches.attrs["ingest"]["documents"] == 1
+    assert searches.attrs["ingest"]["error"] == "server error"
@@ -0,0 +1,90 @@
+import json
+import os
+import pandas as pd
+import pytest
+from src import plan as plan_module
+from src.plan import execute_plan, expand_cells, fingerprint, load_plan, pending_cells
+
+
+def write_plan(tmp_path, **overrides):
+    queries = pd.DataFrame({"query": ["q1", "q2", None], "image_filename": ["a", "b", "c"]})
+    query_file = str(tmp_path / "queries.pkl")
+    queries.to_pickle(query_file)
+    plan = {
+        "name": "test",
+        "output_dir": str(tmp_path / "out"),
+        "datasets": [{"name": "ds", "query_file": query_file}],
+        "endpoints": [{"name": "local", "base_url": "http://localhost"}],
+        "grid": {"top_k": [1, 5]},
+        **overrides,
+    }
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps(plan))
+    return str(path)
+
+
+def test_load_plan_fills_defaults(tmp_path):
+    plan = load_plan(write_plan(tmp_path))
+    assert plan["grid"] == {"top_k": [1, 5], "n_rows": [None]}
+    assert plan["datasets"][0]["collection"] == "ds"
+    assert plan["endpoints"][0]["api_key_env"] == "COLIVARA_API_KEY"
+
+
+def test_load_plan_rejects_unknown_grid_keys(tmp_path):
+    with pytest.raises(ValueError):
+        load_plan(write_plan(tmp_path, grid={"top_n": [5]}))
+
+
+def test_fingerprint_is_order_independent():
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_expand_cells_covers_grid(tmp_path):
+    plan = load_plan(write_plan(tmp_path))
+    cells = expand_cells(plan)
+    assert [cell["params"]["top_k"] for cell in cells] == [1, 5]
+    assert len({cell["fingerprint"] for cell in cells}) == 2
+
+
+def test_execute_plan_skips_completed_cells(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_evaluate(queries_df, client, collection_name, top_k=5):
+        calls.append(top_k)
+        return 0.5, [0.5] * len(queries_df), 0.1, 0
+
+    monkeypatch.setattr(plan_module, "evaluate_rag_model", fake_evaluate)
+    plan = load_plan(write_plan(tmp_path))
+
+    results = execute_plan(plan, lambda endpoint: object())
+    assert sorted(calls) == [1, 5]
+    assert list(results["num_queries"]) == [2, 2]
+    assert list(results["max_workers"]) == [4, 4]
+    assert pending_cells(plan, expand_cells(plan)) == []
+
+    # Adding one k only runs the new cell
+    calls.clear()
+    plan["grid"]["top_k"].append(10)
+    results = execute_plan(plan, lambda endpoint: object())
+    assert calls == [10]
+    assert sorted(results["top_k"]) == [1, 5, 10]
+    assert len(os.listdir(plan["output_dir"])) == 3
+
+
+def test_cells_follow_ingested_document_content(tmp_path):
+    parts_dir = tmp_path / "docs"
+    parts_dir.mkdir()
+    manifest = {"complete": True, "num_rows": 1, "parts": [{"file": "part-00000.pkl", "sha256": "a"}]}
+    (parts_dir / "manifest.json").write_text(json.dumps(manifest))
+    plan = load_plan(write_plan(tmp_path, upsert=True))
+    plan["datasets"][0]["document_file"] = str(tmp_path / "docs.pkl")
+
+    before = [cell["fingerprint"] for cell in expand_cells(plan)]
+    manifest["parts"][0]["sha256"] = "b"
+    (parts_dir / "manifest.json").write_text(json.dumps(manifest))
+    after = [cell["fingerprint"] for cell in expand_cells(plan)]
+    assert not set(before) & set(after)
+
+    plan["upsert"] = False
+    assert "ingest" not in expand_cells(plan)[0]["params"]
@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+import pytest
+from src.scaling import (
+    fit_growth_curve,
+    fit_scaling_results,
+    latency_summary,
+    predict_growth,
+    run_scaling_benchmark,
+)
+
+
+def test_latency_summary():
+    summary = latency_summary([1.0, 2.0, 3.0, 4.0])
+    assert summary["mean"] == 2.5
+    assert summary["p50"] == 2.5
+    assert np.isnan(latency_summary([])["p95"])
+
+
+def test_fit_growth_curve_recovers_power_law():
+    sizes = [100, 250, 500, 1000]
+    values = [0.01 * size**0.5 for size in sizes]
+    fit = fit_growth_curve(sizes, values)
+    assert fit["exponent"] == pytest.approx(0.5)
+    assert fit["coefficient"] == pytest.approx(0.01)
+    assert fit["r2"] == pytest.approx(1.0)
+    assert predict_growth(fit, [10000])[0] == pytest.approx(1.0)
+
+
+def test_fit_growth_curve_needs_two_points():
+    assert np.isnan(fit_growth_curve([100], [0.1])["exponent"])
+
+
+def test_run_scaling_benchmark_upserts_increments(mocker):
+    mocker.patch("src.scaling.check_collection", return_value=False)
+    upsert = mocker.patch("src.scaling.upsert_row", return_value={"total_seconds": 0.5})
+    client = MagicMock()
+    client.get_collection.return_value.num_documents = 10
+    df = pd.DataFrame({"id": range(4)})
+
+    results = run_scaling_benchmark(client, df, ["q1", "q2"], "coll", [2, 4], [1, 3])
+
+    client.create_collection.assert_called_once_with("coll")
+    assert [call.args[2] for call in upsert.call_args_list] == [0, 1, 2, 3]
+    assert list(results["ingest_seconds"]) == [1.0, 1.0, 1.0, 1.0]
+    assert client.search.call_count == 2 * 2 * 2
+    assert list(results["size"]) == [2, 2, 4, 4]
+    assert list(results["top_k"]) == [1, 3, 1, 3]
+    assert list(results["ingested_docs"]) == [2, 2, 2, 2]
+
+    fits = fit_scaling_results(results)
+    assert set(fits["metric"]) == {"p50_latency", "p95_latency", "ingest_docs_per_second"}
+
+
+def test_run_scaling_benchmark_refuses_non_empty_collection(mocker):
+    mocker.patch("src.scaling.check_collection", return_value=True)
+    client = MagicMock()
+    client.get_collection.return_value.num_documents = 10
+
+    with pytest.raises(ValueError):
+        run_scaling_benchmark(client, pd.DataFrame({"id": range(4)}), ["q"], "coll", [2], [1])
+
+    upsert = mocker.patch("src.scaling.upsert_row", return_value={"total_seconds": 0.5})
+    run_scaling_benchmark(client, pd.DataFrame({"id": range(4)}), ["q"], "coll", [2], [1], reset=True)
+    client.delete_collection.assert_called_once_with("coll")
+    client.create_collection.assert_called_once_with("coll")
+    assert upsert.call_count == 2
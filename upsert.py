@@ -3,7 +3,8 @@ from typing import List, Optional
 import pandas as pd
 import os
 from src.client import get_colivara_client
-from src.data_loader import load_data
+from src.metrics import start_live_metrics
+from src.data_loader import load_data, deduplicate_pages
 from src.document_manager import upsert_documents
 
 # List of document files
@@ -44,13 +45,27 @@ def process_file(
     collection_name: str,
     n_rows: Optional[int],
     run_upsert: bool,
+    dedup: bool = False,
+    profile_file: Optional[str] = None,
+    measure_index_wait: bool = False,
 ):
     df: pd.DataFrame = load_data(f"data/full/{file_name}", nrows=n_rows)
     os.path.splitext(file_name)[0]
 
+    if dedup:
+        total_rows = len(df)
+        df = deduplicate_pages(df)
+        print(f"Deduplicated {file_name}: {total_rows} rows -> {len(df)} unique pages")
+
     if run_upsert:
         # Upsert documents and ensure all are added
-        results: List[str] = upsert_documents(client, df, collection_name)
+        results: List[str] = upsert_documents(
+            client,
+            df,
+            collection_name,
+            profile_path=profile_file,
+            measure_index_wait=measure_index_wait,
+        )
         print(f"Total documents upserted for {file_name}: {len(results)}")
 
 
@@ -60,11 +75,22 @@ def main(
     all_files: bool,
     specific_file: Optional[str],
     collection_name: Optional[str],
+    dedup: bool = False,
+    profile_file: Optional[str] = None,
+    measure_index_wait: bool = False,
 ) -> None:
     if all_files:
         for file_name, coll_name in zip(DOCUMENT_FILES, COLLECTION_NAMES):
             print(f"\nProcessing {file_name} with collection {coll_name}...")
-            process_file(file_name, coll_name, n_rows, run_upsert)
+            process_file(
+                file_name,
+                coll_name,
+                n_rows,
+                run_upsert,
+                dedup,
+                profile_file,
+                measure_index_wait,
+            )
     elif specific_file:
         if specific_file in DOCUMENT_FILES:
             # Use the specified collection name if provided, otherwise use default
@@ -74,7 +100,15 @@ def main(
                 else COLLECTION_NAMES[DOCUMENT_FILES.index(specific_file)]
             )
             print(f"\nProcessing {specific_file} with collection {coll_name}...")
-            process_file(specific_file, coll_name, n_rows, run_upsert)
+            process_file(
+                specific_file,
+                coll_name,
+                n_rows,
+                run_upsert,
+                dedup,
+                profile_file,
+                measure_index_wait,
+            )
         else:
             print(
                 f"Error: {specific_file} is not in the list of available document files."
@@ -99,6 +133,11 @@ if __name__ == "__main__":
     parser.add_argument(
         "--all_files", action="store_true", help="Flag to process all document files"
     )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Upload each distinct page image once, storing all of its filenames in the metadata",
+    )
     parser.add_argument(
         "--specific_file",
         type=str,
@@ -109,12 +148,52 @@ if __name__ == "__main__":
         type=str,
         help="Specify a collection name for a specific file (optional, defaults to predefined collection if not specified)",
     )
+    parser.add_argument(
+        "--profile_file",
+        type=str,
+        default=None,
+        help="Append per-document ingest records (size, encode, upload and indexing time) to this Parquet file",
+    )
+    parser.add_argument(
+        "--measure_index_wait",
+        action="store_true",
+        help="Upload without waiting, then poll until indexed, to time upload and indexing separately. "
+        "Existing documents of the same name are deleted and re-created, so that the poll "
+        "does not find the old version",
+    )
+    parser.add_argument(
+        "--metrics_port",
+        type=int,
+        default=None,
+        help="Serve live Prometheus-format metrics on this local port (optional)",
+    )
+    parser.add_argument(
+        "--stats_file",
+        type=str,
+        default=None,
+        help="Periodically write a JSON snapshot of the live metrics to this file (optional)",
+    )
+    parser.add_argument(
+        "--stats_interval",
+        type=float,
+        default=10.0,
+        help="Seconds between stats file writes",
+    )
 
     args = parser.parse_args()
-    main(
-        args.n_rows,
-        args.upsert,
-        args.all_files,
-        args.specific_file,
-        args.collection_name,
+    stop_metrics = start_live_metrics(
+        args.metrics_port, args.stats_file, args.stats_interval
     )
+    try:
+        main(
+            args.n_rows,
+            args.upsert,
+            args.all_files,
+            args.specific_file,
+            args.collection_name,
+            args.dedup,
+            args.profile_file,
+            args.measure_index_wait,
+        )
+    finally:
+        stop_metrics()